@@ -0,0 +1,65 @@
+import argparse
+import timeit
+import tracemalloc
+
+from codebook import CODEBOOKS, DEFAULT_ATTENUATOR
+
+
+# Прежнее кодирование через строки, для сравнения
+def encode_string(index):
+    return list(map(int, list(f'{63 - index:06b}'[::-1])))
+
+
+def decode_string(coils):
+    return 63 - int(''.join(map(str, reversed(coils[0:6]))), 2)
+
+
+def per_index(func, args, number):
+    return [min(timeit.repeat(lambda: func(arg), number=number, repeat=3)) / number * 1e9 for arg in args]
+
+
+def allocated(func, args):
+    for arg in args:
+        func(arg)
+    # Пик трассируемой памяти за вызов: временные строки и списки прежнего способа видны здесь
+    tracemalloc.start()
+    peak = 0
+    for arg in args:
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func(arg)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return peak
+
+
+def report(name, func, args, number):
+    times = per_index(func, args, number)
+    print(f'{name}: среднее {sum(times) / len(times):.0f} нс, мин. {min(times):.0f} нс, макс. {max(times):.0f} нс, '
+          f'разброс {max(times) / min(times):.2f}, выделено памяти за вызов до {allocated(func, args)} байт')
+
+
+def run(attenuator, number):
+    codebook = CODEBOOKS[attenuator]
+    indexes = list(range(codebook.steps))
+    patterns = [list(codebook.encode(index)) for index in indexes]
+    assert all(codebook.decode(codebook.encode(index)) == index for index in indexes)
+    assert all(list(codebook.encode(index)) == encode_string(index) for index in indexes)
+
+    print(f'Аттенюатор {attenuator}, состояний: {codebook.steps}')
+    report('Кодирование (таблица)', codebook.encode, indexes, number)
+    report('Кодирование (строки)', encode_string, indexes, number)
+    report('Декодирование (таблица)', codebook.decode, patterns, number)
+    report('Декодирование (строки)', decode_string, patterns, number)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Микротест кодирования состояний аттенюатора')
+    parser.add_argument('--attenuator', default=DEFAULT_ATTENUATOR, choices=sorted(CODEBOOKS))
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+    run(args.attenuator, args.number)
+
+
+if __name__ == '__main__':
+    main()
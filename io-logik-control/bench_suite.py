@@ -0,0 +1,201 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+
+import psutil
+
+from devices import Device
+from engine import IoEngine
+from histogram import LatencyHistogram
+from simulator import Faults, raise_open_files, run_simulator
+
+
+SIZES = [2, 50, 500, 2000]
+
+# Показатель, направление (больше — лучше) и допустимое абсолютное отклонение, внутри которого
+# относительный допуск не проверяется: у малых значений шум измерения сравним с самим значением
+METRICS = [('polls_per_second', True, 1),
+           ('write_checkback_p50_ms', False, 0.5),
+           ('write_checkback_p95_ms', False, 1),
+           ('write_checkback_p99_ms', False, 2),
+           ('cpu_per_device_ms', False, 0.05),
+           ('memory_per_device_kb', False, 64)]
+
+# Параметры замера, при которых результаты сравнимы с базой
+PARAMETERS = ['interval', 'duration', 'writes']
+
+
+def wait_connected(engine, n_devices, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if sum(stats['connected'] for stats in engine.stats()) == n_devices:
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def measure(n_devices, duration, interval, port, writes):
+    # Имитатор в отдельном процессе, чтобы его CPU и память не попадали в замер движка
+    server = multiprocessing.Process(target=run_simulator,
+                                     args=(n_devices, '127.0.0.1', port, Faults(switch_time=0)), daemon=True)
+    server.start()
+    time.sleep(0.5 + n_devices / 2000)
+
+    process = psutil.Process()
+    gc.collect()
+    engine = IoEngine(poll_min=interval, poll_max=interval, timeout=5, queue_size=64)
+    engine.start()
+    rss_start = process.memory_info().rss
+    for n in range(1, n_devices + 1):
+        engine.add_device(Device(n, '127.0.0.1', port + n - 1))
+    connected = wait_connected(engine, n_devices, 30)
+    time.sleep(1)
+    gc.collect()
+    memory = process.memory_info().rss - rss_start
+
+    # Гистограммы пополняются из потока движка, в котором вызываются обработчики уставок
+    write_checkback = LatencyHistogram()
+    end_to_end = LatencyHistogram()
+    failures = []
+
+    def on_done(result, submitted):
+        if isinstance(result, Exception):
+            failures.append(result)
+            return
+        write_checkback.record(result['latency'])
+        end_to_end.record(time.perf_counter() - submitted)
+
+    rng = random.Random(0)
+    polls_start = sum(stats['polls'] for stats in engine.stats())
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    while time.perf_counter() - wall_start < duration:
+        for n in rng.sample(range(1, n_devices + 1), min(writes, n_devices)):
+            engine.submit_setpoint(n, rng.randrange(64), 0,
+                                   lambda result, submitted=time.perf_counter(): on_done(result, submitted))
+        time.sleep(0.2)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    polls = sum(stats['polls'] for stats in engine.stats()) - polls_start
+
+    engine.stop()
+    server.terminate()
+    server.join()
+
+    summary = write_checkback.summary()
+    total = end_to_end.summary()
+    cpu_per_poll = cpu / polls if polls else float('inf')
+    return {'devices': n_devices, 'connected': connected, 'duration': round(wall, 3), 'polls': polls,
+            'polls_per_second': round(polls / wall, 1),
+            'polls_expected_per_second': round(n_devices / interval, 1),
+            'writes': write_checkback.count, 'write_failures': len(failures),
+            'write_checkback_p50_ms': round(summary['p50'] * 1000, 3),
+            'write_checkback_p95_ms': round(summary['p95'] * 1000, 3),
+            'write_checkback_p99_ms': round(summary['p99'] * 1000, 3),
+            'write_checkback_max_ms': round(summary['max'] * 1000, 3),
+            'end_to_end_p50_ms': round(total['p50'] * 1000, 3),
+            'end_to_end_p95_ms': round(total['p95'] * 1000, 3),
+            'cpu_percent': round(cpu / wall * 100, 1),
+            'cpu_per_device_ms': round(cpu / wall / n_devices * 1000, 4),
+            'cpu_per_poll_us': round(cpu_per_poll * 1e6, 1),
+            # Оценка ёмкости одного ядра при штатном периоде опроса 2 с
+            'devices_per_core': round(2 / cpu_per_poll),
+            'memory_per_device_kb': round(memory / n_devices / 1024, 2)}
+
+
+def mismatched(report, baseline):
+    # Результаты с другим периодом опроса, длительностью или потоком уставок несравнимы с базой
+    return [f'{key} {baseline.get(key)} -> {report[key]}' for key in PARAMETERS if baseline.get(key) != report[key]]
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for size, result in results.items():
+        base = baseline.get(size)
+        if base is None:
+            continue
+        for key, higher_better, slack in METRICS:
+            if key not in base or key not in result:
+                continue
+            value, reference = result[key], base[key]
+            change = reference - value if higher_better else value - reference
+            if change > slack and change > abs(reference) * tolerance:
+                regressions.append(f'{size} модулей: {key} {reference} -> {value}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Набор нагрузочных тестов движка опроса на имитаторе модулей')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--duration', type=float, default=5, help='длительность замера для каждого размера, с')
+    parser.add_argument('--interval', type=float, default=0.1, help='период опроса, с')
+    parser.add_argument('--writes', type=int, default=20, help='уставок на каждые 0,2 с')
+    parser.add_argument('--port', type=int, default=15020)
+    parser.add_argument('--output', help='записать результаты в JSON')
+    parser.add_argument('--baseline', default='bench_baseline.json',
+                        help='сравнить с сохранёнными результатами, если файл существует')
+    parser.add_argument('--save-baseline', action='store_true', help='записать результаты как новую базу')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='допустимое ухудшение, доля')
+    args = parser.parse_args()
+
+    report = {'python': sys.version.split()[0], 'platform': platform.platform(), 'cpus': os.cpu_count(),
+              'interval': args.interval, 'duration': args.duration, 'writes': args.writes}
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        differences = mismatched(report, baseline)
+        if differences:
+            print(f'Параметры замера отличаются от базы {args.baseline}:', *differences, sep='\n  ')
+            print('Запустите с параметрами базы или сохраните новую базу ключом --save-baseline.')
+            sys.exit(1)
+
+    # Сокеты движка по одному на модуль; имитатор поднимает своё ограничение сам
+    raise_open_files(max(args.sizes) + 256)
+    results = {}
+    failed = []
+    for size in args.sizes:
+        result = measure(size, args.duration, args.interval, args.port, args.writes)
+        results[str(size)] = result
+        if not result['connected']:
+            failed.append(size)
+            print(f'Модулей: {size}, подключились не все модули за 30 с, замер недействителен.', flush=True)
+            continue
+        print(f'Модулей: {size}, опросов/с: {result["polls_per_second"]} из {result["polls_expected_per_second"]}, '
+              f'запись -> обратная связь p50/p95/p99: {result["write_checkback_p50_ms"]}/'
+              f'{result["write_checkback_p95_ms"]}/{result["write_checkback_p99_ms"]} мс, '
+              f'CPU: {result["cpu_percent"]} % ({result["cpu_per_device_ms"]} мс/с на модуль, '
+              f'{result["cpu_per_poll_us"]} мкс на опрос, модулей на ядро при периоде 2 с: '
+              f'{result["devices_per_core"]}), память на модуль: {result["memory_per_device_kb"]} КБ', flush=True)
+
+    report['results'] = results
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+    if failed:
+        # Нулевые задержки неподключённых модулей выглядели бы улучшением относительно базы
+        print(f'Замеры для {", ".join(map(str, failed))} модулей недействительны: проверьте ulimit -n.')
+        sys.exit(1)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        print(f'База сохранена в {args.baseline}.')
+        return
+    if baseline is None:
+        return
+
+    regressions = compare(results, baseline['results'], args.tolerance)
+    if regressions:
+        print('Ухудшение относительно базы:', *regressions, sep='\n  ')
+        sys.exit(1)
+    print(f'Ухудшений относительно {args.baseline} нет.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import random
+import time
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=2, base_delay=2, max_delay=60, jitter=0.2):
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.state = CLOSED
+        self.failures = 0
+        self.delay = base_delay
+        self.retry_at = 0
+        self.opened = 0
+
+    def allow(self):
+        if self.state == OPEN and time.monotonic() >= self.retry_at:
+            self.state = HALF_OPEN
+        return self.state != OPEN
+
+    def remaining(self):
+        if self.state != OPEN:
+            return 0
+        return max(0, self.retry_at - time.monotonic())
+
+    def success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.delay = self.base_delay
+
+    def failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            # Разброс задержки не даёт множеству недоступных модулей опрашиваться синхронно
+            delay = self.delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            self.retry_at = time.monotonic() + delay
+            self.delay = min(self.delay * 2, self.max_delay)
+            if self.state != OPEN:
+                self.opened += 1
+            self.state = OPEN
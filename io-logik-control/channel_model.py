@@ -0,0 +1,164 @@
+from PyQt5 import QtGui, QtWidgets
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSignal
+
+from state import DeviceState
+
+
+COLUMNS = ['Комплект', 'IP-адрес', 'Ослабление', 'По умолчанию', 'Обратная связь']
+COLUMN_NAME, COLUMN_IP, COLUMN_ATT, COLUMN_DEFAULT, COLUMN_CHECKBACK = range(len(COLUMNS))
+
+BREAKER_MARKS = {'closed': '', 'open': ' (пауза)', 'half_open': ' (проверка)'}
+BREAKER_TOOLTIPS = {'closed': '', 'open': 'Модуль недоступен, повторное подключение отложено',
+                    'half_open': 'Пробное подключение к модулю'}
+
+
+def att_text(state, index):
+    if index is None:
+        return '—'
+    return f'{state.device.codebook().to_db(index, state.device.thru_loss)} дБ'
+
+
+class ChannelTableModel(QAbstractTableModel):
+    attenuation_edited = pyqtSignal(int)
+
+    def __init__(self, parent=None, flush_interval=100):
+        super().__init__(parent)
+        self.states = []
+        self.rows = {}
+        self.dirty = set()
+        self.icons = [QtGui.QIcon(':/icons/icons/led_red.png'), QtGui.QIcon(':/icons/icons/led_green.png')]
+        # Изменения от опроса копятся и передаются виду диапазонами строк не чаще раза в flush_interval мс
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(flush_interval)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.states)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == COLUMN_ATT and self.states[index.row()].connected:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        state = self.states[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == COLUMN_NAME:
+                return state.device.name
+            if column == COLUMN_IP:
+                return f'{state.device.host}{BREAKER_MARKS[state.breaker]}'
+            if column == COLUMN_ATT:
+                return att_text(state, state.setpoint())
+            if column == COLUMN_DEFAULT:
+                return att_text(state, state.default)
+            if column == COLUMN_CHECKBACK:
+                if not state.connected:
+                    return '—'
+                return 'совпадает' if state.checkback else 'не совпадает'
+        elif role == Qt.EditRole and column == COLUMN_ATT:
+            return state.setpoint()
+        elif role == Qt.DecorationRole and column == COLUMN_IP:
+            return self.icons[state.connected]
+        elif role == Qt.ForegroundRole and column in (COLUMN_ATT, COLUMN_CHECKBACK):
+            if state.connected and not state.checkback:
+                return QtGui.QBrush(Qt.red)
+        elif role == Qt.ToolTipRole and column == COLUMN_IP:
+            return BREAKER_TOOLTIPS[state.breaker] or None
+        elif role == Qt.TextAlignmentRole and column != COLUMN_NAME:
+            return Qt.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or index.column() != COLUMN_ATT:
+            return False
+        self.set_attenuation(self.states[index.row()].device.id, int(value))
+        return True
+
+    def add_channel(self, device):
+        row = len(self.states)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.states.append(DeviceState(device))
+        self.rows[device.id] = row
+        self.endInsertRows()
+
+    def remove_channel(self, n):
+        row = self.rows[n]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.states[row]
+        self.rows = {state.n: i for i, state in enumerate(self.states)}
+        self.dirty.discard(n)
+        self.endRemoveRows()
+
+    def state(self, n):
+        row = self.rows.get(n)
+        return None if row is None else self.states[row]
+
+    def state_at(self, row):
+        return self.states[row]
+
+    def set_state(self, n, state):
+        row = self.rows.get(n)
+        if row is not None:
+            self.states[row] = state
+            self.mark_dirty(n)
+
+    def set_attenuation(self, n, index):
+        state = self.state(n)
+        if state is None or index not in range(state.device.codebook().steps):
+            return
+        # Новая ступень отображается сразу, до подтверждения записи движком
+        state.target = index
+        self.mark_dirty(n)
+        self.attenuation_edited.emit(n)
+
+    def mark_dirty(self, n):
+        self.dirty.add(n)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        rows = sorted(self.rows[n] for n in self.dirty if n in self.rows)
+        self.dirty.clear()
+        # Соседние изменённые строки объединяются в один сигнал dataChanged
+        start = None
+        for i, row in enumerate(rows):
+            if start is None:
+                start = row
+            if i + 1 == len(rows) or rows[i + 1] != row + 1:
+                self.dataChanged.emit(self.index(start, 0), self.index(row, len(COLUMNS) - 1))
+                start = None
+
+
+class AttenuationDelegate(QtWidgets.QStyledItemDelegate):
+    def createEditor(self, parent, option, index):
+        state = index.model().state_at(index.row())
+        editor = QtWidgets.QComboBox(parent)
+        for i in range(state.device.codebook().steps):
+            editor.addItem(att_text(state, i), i)
+        editor.activated.connect(lambda: self.commit_and_close(editor))
+        return editor
+
+    def commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        if index.data(Qt.EditRole) is not None:
+            editor.setCurrentIndex(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        if editor.currentIndex() != index.data(Qt.EditRole):
+            model.setData(index, editor.currentIndex(), Qt.EditRole)
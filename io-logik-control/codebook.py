@@ -0,0 +1,46 @@
+import math
+
+
+class AttenuatorCodebook:
+    def __init__(self, bits=6, step=0.5, inverted=True):
+        self.bits = bits
+        self.step = step
+        self.steps = 1 << bits
+        mask = self.steps - 1
+        # Все состояния аттенюатора вычисляются заранее: ступень <-> код катушек <-> дБ
+        codes = [mask - index if inverted else index for index in range(self.steps)]
+        self.patterns = tuple(tuple((code >> bit) & 1 for bit in range(bits)) for code in codes)
+        self.indexes = [0] * self.steps
+        for index, code in enumerate(codes):
+            self.indexes[code] = index
+        self.indexes = tuple(self.indexes)
+        self.db = tuple(index * step for index in range(self.steps))
+
+    def encode(self, index):
+        return self.patterns[index]
+
+    def decode(self, coils, offset=0):
+        # Цикл без итератора: декодирование не создаёт объектов при каждом опросе
+        code = 0
+        bit = 0
+        while bit < self.bits:
+            code |= coils[offset + bit] << bit
+            bit += 1
+        return self.indexes[code]
+
+    def to_db(self, index, thru_loss=0):
+        return self.db[index] + thru_loss
+
+    def from_db(self, db, thru_loss=0):
+        if not math.isfinite(db):
+            raise ValueError(f'{db} dB is not a step of the attenuator')
+        index = round((db - thru_loss) / self.step)
+        if not 0 <= index < self.steps or abs(self.db[index] + thru_loss - db) > 1e-6:
+            raise ValueError(f'{db} dB is not a step of the attenuator')
+        return index
+
+
+# Цифровой аттенюатор ZSAT-31R5: 6 разрядов по 0.5 дБ, разряд включается нулём на катушке
+CODEBOOKS = {'ZSAT-31R5': AttenuatorCodebook(6, 0.5, inverted=True)}
+
+DEFAULT_ATTENUATOR = 'ZSAT-31R5'
@@ -0,0 +1,239 @@
+import asyncio
+import errno
+import os
+import stat
+import time
+
+from engine import SetpointSuperseded
+
+
+# Строчный протокол для скриптов автоматизации, по одной команде в строке:
+#   SET <n> <дБ>   -> OK <n> <дБ> <обратная связь 1|0>   после записи и чтения обратной связи
+#   DEF <n> <дБ>   -> OK <n> <дБ>                        ослабление по умолчанию
+#   GET <n>        -> ATT <n> <дБ> <по умолчанию, дБ> <соединение 1|0> <обратная связь 1|0>
+#   CHK <n>        -> CHK <n> <обратная связь 1|0> <время с последнего опроса, мс>
+#   LIST           -> LIST <n> <n> ...
+#   PING           -> PONG
+# Ошибки: ERR <текст>. Команды можно отправлять не дожидаясь ответов: записи в разные модули
+# выполняются одновременно, ответы приходят в порядке команд. GET и CHK выполняются после завершения
+# отправленных ранее в этом соединении записей в тот же модуль и показывают результат этих записей.
+
+
+class ControlError(Exception):
+    pass
+
+
+def db_text(state, index):
+    return '-' if index is None else f'{state.device.codebook().to_db(index, state.device.thru_loss):g}'
+
+
+class EngineServer:
+    # Сервер в цикле событий движка: состояние модулей читается без копирования и межпоточных переходов
+    source = 'control'
+
+    def __init__(self, engine, settle_delay=0.1, journal=None):
+        self.engine = engine
+        self.settle_delay = settle_delay
+        self.journal = journal
+        self.server = None
+
+    def start(self, *address):
+        return self.engine.call(self._start(*address))
+
+    def stop(self):
+        return self.engine.call(self._stop())
+
+    async def _stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def _link(self, n):
+        link = self.engine.devices.get(int(n))
+        if link is None:
+            raise ControlError(f'unknown device {n}')
+        return link
+
+    def _index(self, link, db):
+        device = link.device
+        return device.codebook().from_db(float(db), device.thru_loss)
+
+    def _submit(self, submit, done):
+        # Результат движка преобразуется в ответ в момент завершения команды, в его же цикле событий
+        future = asyncio.get_running_loop().create_future()
+
+        def callback(result):
+            if not future.done():
+                future.set_result(done(result))
+
+        submit(callback)
+        return future
+
+    def _att(self, link, index):
+        return link.device.codebook().to_db(index, link.device.thru_loss)
+
+    def _setpoint(self, link, index, done):
+        def journal(result):
+            if self.journal is not None and not isinstance(result, Exception):
+                self.journal('setpoint', link.n, att=self._att(link, index), verified=result['verified'],
+                             latency=round(result['latency'], 6), source=self.source)
+            return done(result)
+
+        return self._submit(lambda callback: self.engine.submit_setpoint(link.n, index, self.settle_delay, callback),
+                            journal)
+
+    def _default(self, link, index, done):
+        def journal(result):
+            if self.journal is not None and not isinstance(result, Exception):
+                self.journal('default', link.n, att=self._att(link, index), source=self.source)
+            return done(result)
+
+        return self._submit(lambda callback: self.engine.submit_default(link.n, index, callback), journal)
+
+
+class LineServer(EngineServer):
+    # Строчный протокол: ответы на команды одного соединения уходят в порядке команд, даже если команды
+    # выполняются одновременно. Подкласс разбирает строку в execute(session, line) и возвращает строку ответа,
+    # Future со строкой (или с None) либо None, если ответа нет
+    async def _serve(self, reader, writer):
+        responses = asyncio.Queue()
+        sender = asyncio.get_running_loop().create_task(self._send(responses, writer))
+        session = self.session()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = self.execute(session, line.decode('utf-8', 'replace'))
+                if response is not None:
+                    responses.put_nowait(response)
+        except ConnectionError:
+            pass
+        finally:
+            responses.put_nowait(None)
+            await sender
+            writer.close()
+
+    async def _send(self, responses, writer):
+        while True:
+            response = await responses.get()
+            if response is None:
+                return
+            if isinstance(response, asyncio.Future):
+                response = await response
+                # Отложенная строка без запросов ответа не даёт
+                if response is None:
+                    continue
+            writer.write(response.encode('utf-8') + b'\n')
+            # Ожидание отправки только при переполненном буфере: ответы на пачку команд уходят вместе
+            if writer.transport.get_write_buffer_size() > 1 << 16:
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    return
+
+    def session(self):
+        return None
+
+
+class ControlServer(LineServer):
+    def __init__(self, engine, settle_delay=0.1, journal=None):
+        super().__init__(engine, settle_delay, journal)
+        self.path = None
+        self.commands = {'SET': self._set, 'DEF': self._set_default, 'GET': self._get, 'CHK': self._checkback,
+                         'LIST': self._list, 'PING': self._ping}
+
+    async def _start(self, path):
+        # Сокет, оставшийся от прошлого запуска, заменяется; сокет работающего сервера не трогается
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            try:
+                _, writer = await asyncio.open_unix_connection(path)
+            except ConnectionRefusedError:
+                os.unlink(path)
+            else:
+                writer.close()
+                raise OSError(errno.EADDRINUSE, f'control socket {path} is in use by another process')
+        self.server = await asyncio.start_unix_server(self._serve, path)
+        os.chmod(path, 0o660)
+        self.path = path
+
+    async def _stop(self):
+        if self.server is not None:
+            await super()._stop()
+            os.unlink(self.path)
+
+    def session(self):
+        # Последняя незавершённая запись в каждый модуль из этого соединения
+        return {}
+
+    def execute(self, session, line):
+        words = line.split()
+        if not words:
+            return 'ERR empty command'
+        command = self.commands.get(words[0].upper())
+        if command is None:
+            return f'ERR unknown command {words[0]}'
+        try:
+            return command(session, *words[1:])
+        except (ControlError, ValueError, TypeError) as e:
+            return f'ERR {e}'
+
+    @staticmethod
+    def _track(session, n, future):
+        session[n] = future
+        future.add_done_callback(lambda future: session.pop(n) if session.get(n) is future else None)
+        return future
+
+    def _after_writes(self, session, n, report):
+        # Записи в модуль выполняются по очереди, поэтому достаточно дождаться последней
+        future = session.get(n)
+        if future is None:
+            return report()
+        return asyncio.get_running_loop().create_task(self._report_after(future, report))
+
+    @staticmethod
+    async def _report_after(future, report):
+        await future
+        return report()
+
+    def _set(self, session, n, db):
+        link = self._link(n)
+        index = self._index(link, db)
+
+        def done(result):
+            if isinstance(result, SetpointSuperseded):
+                return f'ERR {link.n} superseded'
+            if isinstance(result, Exception):
+                return f'ERR {link.n} {result!r}'
+            return f'OK {link.n} {db_text(link.state, index)} {int(result["verified"])}'
+
+        return self._track(session, link.n, self._setpoint(link, index, done))
+
+    def _set_default(self, session, n, db):
+        link = self._link(n)
+        index = self._index(link, db)
+        return self._track(session, link.n, self._default(
+            link, index, lambda result: f'ERR {link.n} {result!r}' if isinstance(result, Exception)
+            else f'OK {link.n} {db_text(link.state, index)}'))
+
+    def _get(self, session, n):
+        state = self._link(n).state
+        return self._after_writes(session, state.n, lambda: f'ATT {state.n} {db_text(state, state.att)} '
+                                                            f'{db_text(state, state.default)} '
+                                                            f'{int(state.connected)} {int(state.checkback)}')
+
+    def _checkback(self, session, n):
+        state = self._link(n).state
+
+        def report():
+            age = '-' if state.polled_at is None else f'{(time.time() - state.polled_at) * 1000:.0f}'
+            return f'CHK {state.n} {int(state.checkback)} {age}'
+
+        return self._after_writes(session, state.n, report)
+
+    def _list(self, session):
+        return 'LIST ' + ' '.join(map(str, self.engine.devices))
+
+    def _ping(self, session):
+        return 'PONG'
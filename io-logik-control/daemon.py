@@ -0,0 +1,342 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import socket
+
+from control import ControlServer
+from devices import Device, DeviceRegistry, DEFAULT_DEVICES
+from engine import IoEngine
+from http_api import HttpApi
+from journal import Journal
+from logwriter import LogWriter
+from metrics import MetricsServer, LATENCY_BOUNDS, collect
+from scpi import ScpiServer
+from tracing import Tracer, finish_setpoint, journal_trace
+
+
+DEFAULT_PORT = 5020
+# Клиент, не успевающий читать события, отключается, чтобы не копить их в памяти службы
+CLIENT_BUFFER = 1 << 20
+
+
+def notify(state):
+    # Уведомление systemd для служб Type=notify без зависимости от libsystemd
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address:
+        return
+    if address.startswith('@'):
+        address = '\0' + address[1:]
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.sendto(state.encode(), address)
+
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+class ControlDaemon:
+    def __init__(self, engine, devices, path=None, log=None, settle_delay=0.1, control_socket=None,
+                 scpi_address=None, http_address=None):
+        self.engine = engine
+        self.devices = devices
+        # Файл, в который сохраняется список модулей после изменений от клиентов
+        self.path = path
+        self.log = log
+        self.settle_delay = settle_delay
+        self.control_socket = control_socket
+        self.control = None
+        # (адрес, порт) серверов SCPI и HTTP API; None — сервер не запускается
+        self.scpi_address = scpi_address
+        self.scpi = None
+        self.http_address = http_address
+        self.http = None
+        self.tracer = Tracer()
+        self.tracer.on_finish = lambda trace: journal_trace(self.journal, trace)
+        self.clients = set()
+        self.states = {}
+        self.loop = None
+        self.server = None
+        self.handlers = {'hello': self._hello, 'add_device': self._upsert_device, 'update_device': self._upsert_device,
+                         'remove_device': self._remove_device, 'setpoint': self._setpoint, 'default': self._default,
+                         'stats': self._stats, 'metrics': self._metrics, 'latency': self._latency}
+
+    def logging(self, text):
+        print(text, flush=True)
+        if self.log is not None:
+            self.log.write(text)
+
+    def journal(self, event, device=None, **values):
+        if self.log is not None:
+            self.log.event(event, device, **values)
+
+    async def start(self, host, port):
+        self.loop = asyncio.get_running_loop()
+        # Обработчики движка вызываются в его потоке, события передаются в цикл службы
+        self.engine.on_state = lambda n, state: self.loop.call_soon_threadsafe(self._on_state, n, state)
+        self.engine.on_breaker = lambda n, state: self.loop.call_soon_threadsafe(self._on_breaker, n, state)
+        self.engine.on_backpressure = lambda n, depth: self.loop.call_soon_threadsafe(
+            self._broadcast, {'event': 'backpressure', 'n': n, 'depth': depth})
+        self.engine.start()
+        for device in self.devices:
+            self.engine.add_device(device)
+        self.server = await asyncio.start_server(self._serve, host, port)
+        if self.control_socket:
+            self.control = ControlServer(self.engine, self.settle_delay, self.journal)
+            await asyncio.wrap_future(self.control.start(self.control_socket))
+        if self.scpi_address is not None:
+            self.scpi = ScpiServer(self.engine, self.settle_delay, self.journal)
+            await asyncio.wrap_future(self.scpi.start(*self.scpi_address))
+        if self.http_address is not None:
+            self.http = HttpApi(self.engine, self.settle_delay, self.journal)
+            await asyncio.wrap_future(self.http.start(*self.http_address))
+        self.logging(f'Служба запущена: модулей {len(self.devices)}, клиенты на {host}:{port}.')
+        self.journal('start')
+
+    async def stop(self):
+        self.server.close()
+        for writer in list(self.clients):
+            writer.close()
+        await self.server.wait_closed()
+        if self.control is not None:
+            await asyncio.wrap_future(self.control.stop())
+        if self.scpi is not None:
+            await asyncio.wrap_future(self.scpi.stop())
+        if self.http is not None:
+            await asyncio.wrap_future(self.http.stop())
+        await self.loop.run_in_executor(None, self.engine.stop)
+        self.logging('Служба остановлена.')
+        self.journal('stop')
+
+    def _on_state(self, n, state):
+        old = self.states.get(n)
+        if old is not None and old.connected != state.connected:
+            self.logging(f'[{n}К] Соединение {["потеряно", "установлено"][state.connected]} (IP: {state.device.host}).')
+            self.journal('connection', n, connected=state.connected, host=state.device.host)
+        self.states[n] = state
+        self._broadcast({'event': 'state', 'n': n, 'state': state.to_dict()})
+
+    def _on_breaker(self, n, state):
+        self.journal('breaker', n, state=state)
+        self._broadcast({'event': 'breaker', 'n': n, 'state': state})
+
+    def _broadcast(self, message):
+        if not self.clients:
+            return
+        data = encode(message)
+        for writer in list(self.clients):
+            self._write(writer, data)
+
+    def _write(self, writer, data):
+        if writer.is_closing():
+            self.clients.discard(writer)
+            return
+        if writer.transport.get_write_buffer_size() > CLIENT_BUFFER:
+            self.clients.discard(writer)
+            writer.close()
+            self.logging('Клиент отключён: не успевает читать события.')
+            return
+        writer.write(data)
+
+    def _reply(self, writer, request_id, result):
+        if isinstance(result, Exception):
+            self._write(writer, encode({'id': request_id, 'error': repr(result), 'type': type(result).__name__}))
+        else:
+            self._write(writer, encode({'id': request_id, 'result': result}))
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    handler = self.handlers[request['op']]
+                except (ValueError, KeyError, TypeError) as e:
+                    self._reply(writer, None, ValueError(f'bad request: {e!r}'))
+                    continue
+                try:
+                    handler(writer, request)
+                except (ValueError, KeyError, TypeError) as e:
+                    self._reply(writer, request.get('id'), e)
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    def _hello(self, writer, request):
+        # После ответа клиент получает все изменения состояния модулей
+        self._reply(writer, request['id'], {'devices': self.devices.to_list(),
+                                            'states': [state.to_dict() | {'n': n} for n, state in self.states.items()]})
+        self.clients.add(writer)
+
+    def _save(self):
+        if self.path is not None:
+            self.devices.save(self.path)
+
+    def _upsert_device(self, writer, request):
+        new = Device.from_dict(request['device'])
+        device = self.devices.get(new.id)
+        if device is None:
+            self.devices.add(new)
+            self.engine.add_device(new)
+            self.logging(f'[{new.id}К] Добавлен модуль (IP: {new.host}).')
+            self.journal('device_added', new.id, host=new.host)
+        elif device.to_dict() != new.to_dict():
+            self.devices.remove(new.id)
+            self.devices.add(new)
+            self.engine.update_device(new)
+        else:
+            self._reply(writer, request['id'], None)
+            return
+        self._save()
+        self._reply(writer, request['id'], None)
+
+    def _remove_device(self, writer, request):
+        n = request['n']
+        if n in self.devices:
+            self.devices.remove(n)
+            self.states.pop(n, None)
+            self.engine.remove_device(n)
+            self.logging(f'[{n}К] Модуль удален.')
+            self.journal('device_removed', n)
+            self._save()
+        self._reply(writer, request['id'], None)
+
+    def _index(self, request):
+        device = self.devices[request['n']]
+        index = request['index']
+        if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < device.codebook().steps:
+            raise ValueError(f'step {index!r} is out of range for device {device.id}')
+        return device, index
+
+    def _settle(self, request):
+        settle = request.get('settle', self.settle_delay)
+        if isinstance(settle, bool) or not isinstance(settle, (int, float)) or not 0 <= settle < math.inf:
+            raise ValueError(f'settle delay {settle!r} must be a finite non-negative number')
+        return settle
+
+    def _setpoint(self, writer, request):
+        n = request['n']
+        device, index = self._index(request)
+        settle = self._settle(request)
+        att = device.codebook().to_db(index, device.thru_loss)
+        trace = self.tracer.start(n, att)
+        trace.span('gui', trace.start)
+
+        def done(result):
+            finish_setpoint(trace, n, att, result, self.journal)
+            self._reply(writer, request['id'], result)
+
+        self.engine.submit_setpoint(n, index, settle,
+                                    lambda result: self.loop.call_soon_threadsafe(done, result), trace)
+
+    def _default(self, writer, request):
+        n = request['n']
+        device, index = self._index(request)
+        att = device.codebook().to_db(index, device.thru_loss)
+
+        def done(result):
+            if not isinstance(result, Exception):
+                self.journal('default', n, att=att)
+            self._reply(writer, request['id'], result)
+
+        self.engine.submit_default(n, index, lambda result: self.loop.call_soon_threadsafe(done, result))
+
+    def _executor(self, writer, request, func):
+        # Сводки движка собираются в его потоке; цикл службы в это время обслуживает остальных клиентов
+        future = self.loop.run_in_executor(None, func)
+        future.add_done_callback(
+            lambda future: self._reply(writer, request['id'], future.exception() or future.result()))
+
+    def _stats(self, writer, request):
+        self._executor(writer, request, self.engine.stats)
+
+    def _metrics(self, writer, request):
+        self._executor(writer, request, lambda: self.engine.metrics(request.get('bounds', LATENCY_BOUNDS)))
+
+    def _latency(self, writer, request):
+        self._executor(writer, request, lambda: {
+            n: {operation: histogram.to_dict() for operation, histogram in operations.items()}
+            for n, operations in self.engine.latency().items()})
+
+    def collect_metrics(self):
+        return collect(self.engine, self.log,
+                       {'iologik_clients': ('gauge', 'Подключённые клиенты службы', len(self.clients))})
+
+
+async def serve(daemon, host, port):
+    stop = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+        except (NotImplementedError, AttributeError):
+            # Windows: остановка по Ctrl+C через KeyboardInterrupt
+            pass
+    await daemon.start(host, port)
+    notify('READY=1')
+    try:
+        await stop.wait()
+    finally:
+        notify('STOPPING=1')
+        await daemon.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Служба опроса и управления модулями ioLogik без интерфейса')
+    parser.add_argument('--devices', default='devices.json',
+                        help='список модулей в JSON; изменения от клиентов сохраняются в этот же файл')
+    parser.add_argument('--host', default='127.0.0.1', help='адрес для подключения интерфейса')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--poll-min', type=float, default=0.5)
+    parser.add_argument('--poll-max', type=float, default=5)
+    parser.add_argument('--timeout', type=float, default=2)
+    parser.add_argument('--checkback-delay', type=int, default=100, help='задержка чтения обратной связи, мс')
+    parser.add_argument('--metrics-port', type=int, default=0)
+    parser.add_argument('--metrics-host', default='127.0.0.1',
+                        help='адрес сервера метрик; 0.0.0.0 — для сбора сервером Prometheus по сети')
+    parser.add_argument('--control-socket', help='Unix-сокет строчного протокола для скриптов (control.py)')
+    parser.add_argument('--scpi-port', type=int, help='TCP-порт команд SCPI (scpi.py, обычно 5025)')
+    parser.add_argument('--scpi-host', default='127.0.0.1',
+                        help='адрес сервера SCPI; 0.0.0.0 — для приборов и стендов в сети')
+    parser.add_argument('--http-port', type=int, help='порт HTTP/JSON API (http_api.py)')
+    parser.add_argument('--http-host', default='127.0.0.1',
+                        help='адрес HTTP API; API без проверки доступа, открывать в сеть только за межсетевым экраном')
+    parser.add_argument('--logs', default='ioLogik_logs', help='каталог журналов; пустая строка отключает запись')
+    args = parser.parse_args()
+
+    if os.path.exists(args.devices):
+        devices = DeviceRegistry.load(args.devices)
+    else:
+        devices = DeviceRegistry.from_list(DEFAULT_DEVICES)
+    log = None
+    if args.logs:
+        os.makedirs(args.logs, exist_ok=True)
+        log = LogWriter(args.logs, Journal(args.logs))
+        log.start()
+
+    engine = IoEngine(poll_min=args.poll_min, poll_max=args.poll_max, timeout=args.timeout)
+    daemon = ControlDaemon(engine, devices, args.devices, log, args.checkback_delay / 1000, args.control_socket,
+                           (args.scpi_host, args.scpi_port) if args.scpi_port else None,
+                           (args.http_host, args.http_port) if args.http_port else None)
+    metrics = None
+    if args.metrics_port:
+        metrics = MetricsServer(args.metrics_port, daemon.collect_metrics, args.metrics_host)
+        metrics.start()
+    try:
+        asyncio.run(serve(daemon, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if metrics is not None:
+            metrics.stop()
+        if log is not None:
+            log.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import threading
+import time
+
+from daemon import DEFAULT_PORT
+from devices import Device, DeviceRegistry
+from engine import SetpointSuperseded
+from histogram import LatencyHistogram
+from state import DeviceState
+
+
+class DaemonError(Exception):
+    pass
+
+
+class DaemonClient:
+    # Подключение интерфейса к службе daemon.py; повторяет интерфейс IoEngine, которым пользуется main.py
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, timeout=5, retry=1):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retry = retry
+        self.devices = DeviceRegistry()
+        self.states = {}
+        self.on_state = None
+        self.on_backpressure = None
+        self.on_breaker = None
+        self.started = False
+        self.loop = asyncio.new_event_loop()
+        self._writer = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._session = None
+        self._thread = threading.Thread(target=self._run, name='DaemonClient', daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def connect(self):
+        # Первое подключение выполняется до создания окна: из ответа службы берётся список модулей
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._connect(), self.loop).result()
+
+    async def _connect(self):
+        connected = self.loop.create_future()
+        self._session = self.loop.create_task(self._sessions(connected))
+        await asyncio.wait_for(connected, self.timeout)
+
+    def start(self):
+        self.started = True
+        self.loop.call_soon_threadsafe(self._replay)
+
+    def stop(self):
+        if not self._thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+    async def _close(self):
+        # При закрытии интерфейс не получает событий о потере связи
+        self.started = False
+        if self._session is not None:
+            self._session.cancel()
+            await asyncio.gather(self._session, return_exceptions=True)
+
+    async def _sessions(self, connected):
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port, limit=1 << 20)
+            except OSError as e:
+                if not connected.done():
+                    connected.set_exception(e)
+                    return
+                await asyncio.sleep(self.retry)
+                continue
+            self._writer = writer
+            self._request({'op': 'hello'}, lambda message: self._hello(message, connected))
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    self._dispatch(json.loads(line))
+            except (OSError, ValueError):
+                pass
+            finally:
+                self._writer = None
+                writer.close()
+                self._disconnected()
+            await asyncio.sleep(self.retry)
+
+    def _disconnected(self):
+        pending, self._pending = self._pending, {}
+        for callback in pending.values():
+            callback({'error': repr(ConnectionError('нет связи со службой'))})
+        # Пока службы нет, все модули показываются без соединения
+        for n, state in self.states.items():
+            if state.connected:
+                state = state.copy()
+                state.connected = False
+                self._set_state(n, state)
+
+    def _hello(self, message, connected):
+        if 'error' in message:
+            if not connected.done():
+                connected.set_exception(DaemonError(message['error']))
+            return
+        for data in message['result']['devices']:
+            if data['id'] not in self.devices:
+                self.devices.add(Device.from_dict(data))
+        for data in message['result']['states']:
+            self._state(data['n'], data)
+        if not connected.done():
+            connected.set_result(None)
+
+    def _replay(self):
+        if self.on_state is not None:
+            for n, state in self.states.items():
+                self.on_state(n, state)
+
+    def _dispatch(self, message):
+        event = message.get('event')
+        if event is None:
+            callback = self._pending.pop(message['id'], None)
+            if callback is not None:
+                callback(message)
+        elif event == 'state':
+            self._state(message['n'], message['state'])
+        elif event == 'breaker' and self.started and self.on_breaker is not None:
+            self.on_breaker(message['n'], message['state'])
+        elif event == 'backpressure' and self.started and self.on_backpressure is not None:
+            self.on_backpressure(message['n'], message['depth'])
+
+    def _state(self, n, data):
+        device = self.devices.get(n)
+        if device is not None:
+            self._set_state(n, DeviceState.from_dict(device, data))
+
+    def _set_state(self, n, state):
+        self.states[n] = state
+        if self.started and self.on_state is not None:
+            self.on_state(n, state)
+
+    def _request(self, message, callback):
+        if self._writer is None:
+            callback({'error': repr(ConnectionError('нет связи со службой'))})
+            return
+        message['id'] = next(self._ids)
+        self._pending[message['id']] = callback
+        self._writer.write((json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    def _send(self, message, callback=lambda message: None):
+        self.loop.call_soon_threadsafe(self._request, message, callback)
+
+    def _call(self, message):
+        future = concurrent.futures.Future()
+        self._send(message, future.set_result)
+        message = future.result(self.timeout)
+        if 'error' in message:
+            raise DaemonError(message['error'])
+        return message['result']
+
+    def _summary(self, message, empty):
+        # Пока службы нет, сводки пусты: модули показываются без соединения, а не ошибкой интерфейса
+        try:
+            return self._call(message)
+        except (DaemonError, concurrent.futures.TimeoutError):
+            return empty
+
+    @staticmethod
+    def _result(message):
+        if 'error' not in message:
+            return message['result']
+        if message.get('type') == 'SetpointSuperseded':
+            return SetpointSuperseded(message['error'])
+        return DaemonError(message['error'])
+
+    def add_device(self, device):
+        self._send({'op': 'add_device', 'device': device.to_dict()})
+
+    def update_device(self, device):
+        self._send({'op': 'update_device', 'device': device.to_dict()})
+
+    def remove_device(self, n):
+        self.loop.call_soon_threadsafe(self.states.pop, n, None)
+        self._send({'op': 'remove_device', 'n': n})
+
+    def submit_setpoint(self, n, index, settle_delay, on_done, trace=None):
+        sent = time.perf_counter()
+
+        def done(message):
+            # Этапы внутри службы записываются в её собственный журнал трасс
+            if trace is not None:
+                trace.span('daemon', sent)
+                trace.done_at = time.perf_counter()
+                trace.done('poll')
+            on_done(self._result(message))
+
+        self._send({'op': 'setpoint', 'n': n, 'index': index, 'settle': settle_delay}, done)
+
+    def submit_default(self, n, index, on_done):
+        self._send({'op': 'default', 'n': n, 'index': index}, lambda message: on_done(self._result(message)))
+
+    def invoke(self, func):
+        future = concurrent.futures.Future()
+        self.loop.call_soon_threadsafe(lambda: future.set_result(func()))
+        return future.result()
+
+    def stats(self):
+        return self._summary({'op': 'stats'}, [])
+
+    def metrics(self, bounds):
+        return self._summary({'op': 'metrics', 'bounds': bounds}, [])
+
+    def latency(self):
+        return {int(n): {operation: LatencyHistogram.from_dict(data) for operation, data in operations.items()}
+                for n, operations in self._summary({'op': 'latency'}, {}).items()}
@@ -0,0 +1,109 @@
+import json
+
+from codebook import CODEBOOKS, DEFAULT_ATTENUATOR
+
+
+DEFAULT_DEVICES = [{'id': 1, 'host': '192.168.10.84'}, {'id': 2, 'host': '192.168.10.85'}]
+
+
+class Device:
+    def __init__(self, id, host, port=502, unit=1, thru_loss=4.5, name='',
+                 att_coil=0, default_coil=6, checkback_input=0, attenuator=DEFAULT_ATTENUATOR):
+        # Значения вне диапазона Modbus TCP иначе обнаружились бы только при опросе, в потоке движка
+        if not 1 <= port <= 65535:
+            raise ValueError(f'port {port} is out of range 1-65535')
+        if not 0 <= unit <= 255:
+            raise ValueError(f'unit {unit} is out of range 0-255')
+        if attenuator not in CODEBOOKS:
+            raise ValueError(f'unknown attenuator {attenuator}')
+        self.id = id
+        self.host = host
+        self.port = port
+        self.unit = unit
+        self.thru_loss = thru_loss
+        self.name = name or f'{id} комплект'
+        # Разводка модуля: адреса катушек текущего ослабления и ослабления по умолчанию,
+        # адрес первого дискретного входа обратной связи
+        self.att_coil = att_coil
+        self.default_coil = default_coil
+        self.checkback_input = checkback_input
+        self.attenuator = attenuator
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(int(data['id']), str(data['host']), int(data.get('port', 502)), int(data.get('unit', 1)),
+                   float(data.get('thru_loss', 4.5)), str(data.get('name', '')), int(data.get('att_coil', 0)),
+                   int(data.get('default_coil', 6)), int(data.get('checkback_input', 0)),
+                   str(data.get('attenuator', DEFAULT_ATTENUATOR)))
+
+    def to_dict(self):
+        return {'id': self.id, 'host': self.host, 'port': self.port, 'unit': self.unit,
+                'thru_loss': self.thru_loss, 'name': self.name, 'att_coil': self.att_coil,
+                'default_coil': self.default_coil, 'checkback_input': self.checkback_input,
+                'attenuator': self.attenuator}
+
+    def address(self):
+        return self.host, self.port, self.unit
+
+    def codebook(self):
+        return CODEBOOKS[self.attenuator]
+
+
+class DeviceRegistry:
+    def __init__(self, devices=()):
+        self._devices = {}
+        for device in devices:
+            self.add(device)
+
+    def __iter__(self):
+        return iter(self._devices.values())
+
+    def __len__(self):
+        return len(self._devices)
+
+    def __contains__(self, device_id):
+        return device_id in self._devices
+
+    def __getitem__(self, device_id):
+        return self._devices[device_id]
+
+    def get(self, device_id):
+        return self._devices.get(device_id)
+
+    def ids(self):
+        return list(self._devices)
+
+    def add(self, device):
+        if device.id in self._devices:
+            raise ValueError(f'duplicate device id {device.id}')
+        self._devices[device.id] = device
+        return device
+
+    def remove(self, device_id):
+        return self._devices.pop(device_id)
+
+    def next_id(self):
+        return max(self._devices, default=0) + 1
+
+    def to_list(self):
+        return [device.to_dict() for device in self]
+
+    @classmethod
+    def from_list(cls, data):
+        return cls(Device.from_dict(item) for item in data)
+
+    def to_json(self):
+        return json.dumps(self.to_list(), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_list(json.loads(text))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_list(json.load(f))
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_list(), f, ensure_ascii=False, indent=4)
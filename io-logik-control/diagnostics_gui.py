@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'diagnostics_gui.ui'
+#
+# Created by: PyQt5 UI code generator 5.13.2
+#
+# WARNING! All changes made in this file will be lost!
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        Form.setObjectName("Form")
+        Form.resize(720, 420)
+        Form.setMinimumSize(QtCore.QSize(560, 360))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        Form.setFont(font)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(":/icons/icons/Settings.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        Form.setWindowIcon(icon)
+        self.gridLayout = QtWidgets.QGridLayout(Form)
+        self.gridLayout.setObjectName("gridLayout")
+        self.tabWidget = QtWidgets.QTabWidget(Form)
+        self.tabWidget.setObjectName("tabWidget")
+        self.tab_latency = QtWidgets.QWidget()
+        self.tab_latency.setObjectName("tab_latency")
+        self.gridLayout_latency = QtWidgets.QGridLayout(self.tab_latency)
+        self.gridLayout_latency.setObjectName("gridLayout_latency")
+        self.tableWidget_latency = QtWidgets.QTableWidget(self.tab_latency)
+        self.tableWidget_latency.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tableWidget_latency.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableWidget_latency.setObjectName("tableWidget_latency")
+        self.tableWidget_latency.setColumnCount(7)
+        self.tableWidget_latency.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_latency.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_latency.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_latency.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_latency.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_latency.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_latency.setHorizontalHeaderItem(5, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_latency.setHorizontalHeaderItem(6, item)
+        self.tableWidget_latency.horizontalHeader().setStretchLastSection(True)
+        self.tableWidget_latency.verticalHeader().setVisible(False)
+        self.gridLayout_latency.addWidget(self.tableWidget_latency, 0, 0, 1, 3)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.gridLayout_latency.addItem(spacerItem, 1, 0, 1, 1)
+        self.pushButton_latency_refresh = QtWidgets.QPushButton(self.tab_latency)
+        self.pushButton_latency_refresh.setObjectName("pushButton_latency_refresh")
+        self.gridLayout_latency.addWidget(self.pushButton_latency_refresh, 1, 1, 1, 1)
+        self.pushButton_latency_export = QtWidgets.QPushButton(self.tab_latency)
+        self.pushButton_latency_export.setObjectName("pushButton_latency_export")
+        self.gridLayout_latency.addWidget(self.pushButton_latency_export, 1, 2, 1, 1)
+        self.tabWidget.addTab(self.tab_latency, "")
+        self.tab_resources = QtWidgets.QWidget()
+        self.tab_resources.setObjectName("tab_resources")
+        self.gridLayout_resources = QtWidgets.QGridLayout(self.tab_resources)
+        self.gridLayout_resources.setObjectName("gridLayout_resources")
+        self.tableWidget_resources = QtWidgets.QTableWidget(self.tab_resources)
+        self.tableWidget_resources.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tableWidget_resources.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableWidget_resources.setObjectName("tableWidget_resources")
+        self.tableWidget_resources.setColumnCount(8)
+        self.tableWidget_resources.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_resources.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_resources.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_resources.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_resources.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_resources.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_resources.setHorizontalHeaderItem(5, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_resources.setHorizontalHeaderItem(6, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_resources.setHorizontalHeaderItem(7, item)
+        self.tableWidget_resources.horizontalHeader().setStretchLastSection(True)
+        self.tableWidget_resources.verticalHeader().setVisible(False)
+        self.gridLayout_resources.addWidget(self.tableWidget_resources, 0, 0, 1, 3)
+        self.label_growth = QtWidgets.QLabel(self.tab_resources)
+        self.label_growth.setText("")
+        self.label_growth.setObjectName("label_growth")
+        self.gridLayout_resources.addWidget(self.label_growth, 1, 0, 1, 1)
+        self.pushButton_resources_refresh = QtWidgets.QPushButton(self.tab_resources)
+        self.pushButton_resources_refresh.setObjectName("pushButton_resources_refresh")
+        self.gridLayout_resources.addWidget(self.pushButton_resources_refresh, 1, 1, 1, 1)
+        self.pushButton_snapshot = QtWidgets.QPushButton(self.tab_resources)
+        self.pushButton_snapshot.setObjectName("pushButton_snapshot")
+        self.gridLayout_resources.addWidget(self.pushButton_snapshot, 1, 2, 1, 1)
+        self.plainTextEdit_snapshot = QtWidgets.QPlainTextEdit(self.tab_resources)
+        self.plainTextEdit_snapshot.setReadOnly(True)
+        self.plainTextEdit_snapshot.setObjectName("plainTextEdit_snapshot")
+        self.gridLayout_resources.addWidget(self.plainTextEdit_snapshot, 2, 0, 1, 3)
+        self.tabWidget.addTab(self.tab_resources, "")
+        self.tab_profile = QtWidgets.QWidget()
+        self.tab_profile.setObjectName("tab_profile")
+        self.gridLayout_profile = QtWidgets.QGridLayout(self.tab_profile)
+        self.gridLayout_profile.setObjectName("gridLayout_profile")
+        self.plainTextEdit_profile = QtWidgets.QPlainTextEdit(self.tab_profile)
+        font = QtGui.QFont()
+        font.setFamily("Courier New")
+        font.setPointSize(9)
+        self.plainTextEdit_profile.setFont(font)
+        self.plainTextEdit_profile.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.plainTextEdit_profile.setReadOnly(True)
+        self.plainTextEdit_profile.setObjectName("plainTextEdit_profile")
+        self.gridLayout_profile.addWidget(self.plainTextEdit_profile, 0, 0, 1, 1)
+        self.tabWidget.addTab(self.tab_profile, "")
+        self.tab_traces = QtWidgets.QWidget()
+        self.tab_traces.setObjectName("tab_traces")
+        self.gridLayout_traces = QtWidgets.QGridLayout(self.tab_traces)
+        self.gridLayout_traces.setObjectName("gridLayout_traces")
+        self.splitter_traces = QtWidgets.QSplitter(self.tab_traces)
+        self.splitter_traces.setOrientation(QtCore.Qt.Vertical)
+        self.splitter_traces.setObjectName("splitter_traces")
+        self.tableWidget_traces = QtWidgets.QTableWidget(self.splitter_traces)
+        self.tableWidget_traces.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tableWidget_traces.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.tableWidget_traces.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableWidget_traces.setObjectName("tableWidget_traces")
+        self.tableWidget_traces.setColumnCount(5)
+        self.tableWidget_traces.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_traces.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_traces.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_traces.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_traces.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_traces.setHorizontalHeaderItem(4, item)
+        self.tableWidget_traces.horizontalHeader().setStretchLastSection(True)
+        self.tableWidget_traces.verticalHeader().setVisible(False)
+        self.widget_waterfall = WaterfallWidget(self.splitter_traces)
+        self.widget_waterfall.setMinimumSize(QtCore.QSize(0, 150))
+        self.widget_waterfall.setObjectName("widget_waterfall")
+        self.gridLayout_traces.addWidget(self.splitter_traces, 0, 0, 1, 2)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.gridLayout_traces.addItem(spacerItem1, 1, 0, 1, 1)
+        self.pushButton_traces_refresh = QtWidgets.QPushButton(self.tab_traces)
+        self.pushButton_traces_refresh.setObjectName("pushButton_traces_refresh")
+        self.gridLayout_traces.addWidget(self.pushButton_traces_refresh, 1, 1, 1, 1)
+        self.tabWidget.addTab(self.tab_traces, "")
+        self.gridLayout.addWidget(self.tabWidget, 0, 0, 1, 1)
+
+        self.retranslateUi(Form)
+        self.tabWidget.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(Form)
+
+    def retranslateUi(self, Form):
+        _translate = QtCore.QCoreApplication.translate
+        Form.setWindowTitle(_translate("Form", "Диагностика"))
+        self.tableWidget_latency.setSortingEnabled(True)
+        item = self.tableWidget_latency.horizontalHeaderItem(0)
+        item.setText(_translate("Form", "Модуль"))
+        item = self.tableWidget_latency.horizontalHeaderItem(1)
+        item.setText(_translate("Form", "Операция"))
+        item = self.tableWidget_latency.horizontalHeaderItem(2)
+        item.setText(_translate("Form", "Количество"))
+        item = self.tableWidget_latency.horizontalHeaderItem(3)
+        item.setText(_translate("Form", "p50, мс"))
+        item = self.tableWidget_latency.horizontalHeaderItem(4)
+        item.setText(_translate("Form", "p95, мс"))
+        item = self.tableWidget_latency.horizontalHeaderItem(5)
+        item.setText(_translate("Form", "p99, мс"))
+        item = self.tableWidget_latency.horizontalHeaderItem(6)
+        item.setText(_translate("Form", "Макс., мс"))
+        self.pushButton_latency_refresh.setText(_translate("Form", "Обновить"))
+        self.pushButton_latency_export.setText(_translate("Form", "Экспорт..."))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_latency), _translate("Form", "Задержки операций"))
+        item = self.tableWidget_resources.horizontalHeaderItem(0)
+        item.setText(_translate("Form", "Время"))
+        item = self.tableWidget_resources.horizontalHeaderItem(1)
+        item.setText(_translate("Form", "RSS, МБ"))
+        item = self.tableWidget_resources.horizontalHeaderItem(2)
+        item.setText(_translate("Form", "USS, МБ"))
+        item = self.tableWidget_resources.horizontalHeaderItem(3)
+        item.setText(_translate("Form", "Дескрипторы"))
+        item = self.tableWidget_resources.horizontalHeaderItem(4)
+        item.setText(_translate("Form", "Сокеты"))
+        item = self.tableWidget_resources.horizontalHeaderItem(5)
+        item.setText(_translate("Form", "Потоки"))
+        item = self.tableWidget_resources.horizontalHeaderItem(6)
+        item.setText(_translate("Form", "Объекты Qt"))
+        item = self.tableWidget_resources.horizontalHeaderItem(7)
+        item.setText(_translate("Form", "Сборки GC"))
+        self.pushButton_resources_refresh.setText(_translate("Form", "Обновить"))
+        self.pushButton_snapshot.setToolTip(_translate("Form", "Первое нажатие включает трассировку памяти, следующие показывают прирост с предыдущего снимка. Трассировка выключается при закрытии окна"))
+        self.pushButton_snapshot.setText(_translate("Form", "Снимок памяти"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_resources), _translate("Form", "Ресурсы"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_profile), _translate("Form", "Профилирование"))
+        item = self.tableWidget_traces.horizontalHeaderItem(0)
+        item.setText(_translate("Form", "Время"))
+        item = self.tableWidget_traces.horizontalHeaderItem(1)
+        item.setText(_translate("Form", "Модуль"))
+        item = self.tableWidget_traces.horizontalHeaderItem(2)
+        item.setText(_translate("Form", "Ослабление, дБ"))
+        item = self.tableWidget_traces.horizontalHeaderItem(3)
+        item.setText(_translate("Form", "Итого, мс"))
+        item = self.tableWidget_traces.horizontalHeaderItem(4)
+        item.setText(_translate("Form", "Результат"))
+        self.pushButton_traces_refresh.setText(_translate("Form", "Обновить"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_traces), _translate("Form", "Трассировка команд"))
+from waterfall import WaterfallWidget
+import resources_rc
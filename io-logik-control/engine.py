@@ -0,0 +1,388 @@
+import asyncio
+import threading
+import time
+
+from breaker import CircuitBreaker, CircuitOpen
+from modbus_async import AsyncModbusClient, ModbusError
+from scheduler import PollSchedule
+from state import DeviceState
+
+
+IO_ERRORS = (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ModbusError)
+
+# Элемент очереди команд: SETPOINT — уставка из слота link.setpoint, иначе (ступень, on_done) — ослабление по умолчанию
+SETPOINT = object()
+
+
+class CommandQueueFull(Exception):
+    pass
+
+
+class SetpointSuperseded(Exception):
+    pass
+
+
+class UnknownDevice(Exception):
+    pass
+
+
+class DeviceLink:
+    def __init__(self, device, timeout, queue_size, schedule):
+        self.n = device.id
+        self.device = device
+        self.client = AsyncModbusClient(device.host, device.port, device.unit, timeout)
+        self.commands = asyncio.Queue(queue_size)
+        self.schedule = schedule
+        self.wakeup = asyncio.Event()
+        self.breaker = CircuitBreaker()
+        self.state = DeviceState(device)
+        self.published = None
+        self.poll_task = None
+        self.command_task = None
+        self.polls = 0
+        self.poll_failures = 0
+        self.checkback_mismatches = 0
+        self.setpoint = None
+        # Трасса записанной уставки ждёт опроса, прочитавшего записанное значение
+        self.confirm = None
+        self.setpoints_sent = 0
+        self.setpoints_coalesced = 0
+        self.commands_sent = 0
+        self.commands_rejected = 0
+        self.commands_failed_fast = 0
+
+
+class IoEngine:
+    def __init__(self, poll_min=0.5, poll_max=5, timeout=2, queue_size=16):
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.on_state = None
+        self.on_backpressure = None
+        self.on_breaker = None
+        self.loop = asyncio.new_event_loop()
+        self.devices = {}
+        self._thread = threading.Thread(target=self._run, name='IoEngine', daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+    async def _shutdown(self):
+        # Все модули снимаются одновременно: при поочерёдном снятии каждый ждёт цикла опроса остальных
+        await asyncio.gather(*(self._remove_device(n) for n in list(self.devices)))
+
+    def call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def invoke(self, func):
+        return self.call(self._invoke(func)).result()
+
+    async def _invoke(self, func):
+        return func()
+
+    def add_device(self, device):
+        return self.call(self._add_device(device))
+
+    async def _add_device(self, device):
+        link = DeviceLink(device, self.timeout, self.queue_size, PollSchedule(self.poll_min, self.poll_max))
+        self.devices[device.id] = link
+        link.poll_task = self.loop.create_task(self._poll_device(link))
+        link.command_task = self.loop.create_task(self._command_worker(link))
+
+    def remove_device(self, n):
+        return self.call(self._remove_device(n))
+
+    async def _remove_device(self, n):
+        link = self.devices.pop(n, None)
+        if link is not None:
+            tasks = [link.poll_task, link.command_task]
+            # wait_for до Python 3.12 теряет отмену, если ожидаемый ответ пришёл в том же цикле событий,
+            # поэтому отмена повторяется, пока задачи не завершатся
+            while not all(task.done() for task in tasks):
+                for task in tasks:
+                    task.cancel()
+                await asyncio.wait(tasks, timeout=0.5)
+            link.client.close()
+            self._drain(link, UnknownDevice(f'device {n} was removed'))
+
+    @staticmethod
+    def _drain(link, error):
+        # Ожидающие команды снятого модуля завершаются ошибкой, иначе их ответов ждали бы бесконечно
+        if link.confirm is not None:
+            link.confirm[0].abort('unconfirmed')
+            link.confirm = None
+        if link.setpoint is not None:
+            on_done = link.setpoint[2]
+            link.setpoint = None
+            on_done(error)
+        while not link.commands.empty():
+            item = link.commands.get_nowait()
+            if item is not SETPOINT:
+                item[1](error)
+
+    def update_device(self, device):
+        return self.call(self._update_device(device))
+
+    async def _update_device(self, device):
+        link = self.devices[device.id]
+        link.device = link.state.device = device
+        if (link.client.host, link.client.port, link.client.unit_id) != device.address():
+            link.client.close()
+            link.client = AsyncModbusClient(device.host, device.port, device.unit, self.timeout)
+            link.breaker = CircuitBreaker()
+            self._report_breaker(link)
+            self._poll_soon(link)
+
+    def _poll_soon(self, link):
+        link.schedule.changed()
+        link.wakeup.set()
+
+    async def _write_verify(self, link, coils, settle_delay, trace=None):
+        start = time.perf_counter()
+        await link.client.write_multiple_coils(link.device.att_coil, coils)
+        written = time.perf_counter()
+        await asyncio.sleep(settle_delay)
+        settled = time.perf_counter()
+        checkback_coils = await link.client.read_discrete_inputs(link.device.checkback_input, len(coils))
+        if trace is not None:
+            trace.span('write', start, written)
+            trace.span('settle', written, settled)
+            trace.span('checkback', settled)
+        verified = [bool(bit) for bit in coils] == checkback_coils
+        if not verified:
+            link.checkback_mismatches += 1
+        return {'verified': verified, 'checkback': list(map(int, checkback_coils)),
+                'latency': time.perf_counter() - start}
+
+    def _await_confirm(self, link, trace, index):
+        if link.confirm is not None:
+            link.confirm[0].abort('unconfirmed')
+            link.confirm = None
+        if trace is not None:
+            link.confirm = (trace, index, time.perf_counter())
+
+    def _report_breaker(self, link):
+        if link.breaker.state != link.state.breaker:
+            link.state.breaker = link.breaker.state
+            if self.on_breaker is not None:
+                self.on_breaker(link.n, link.state.breaker)
+
+    def _publish(self, link):
+        # Копия состояния передаётся подписчику только при изменении значимых полей
+        key = link.state.key()
+        if key != link.published:
+            link.published = key
+            if self.on_state is not None:
+                self.on_state(link.n, link.state.copy())
+
+    def _setpoint_done(self, link):
+        # Цель сбрасывается, только если за время записи не пришла более новая уставка
+        if link.setpoint is None:
+            link.state.target = None
+
+    def _fail_fast(self, link, on_done):
+        # Команды модулю с разомкнутой цепью не ждут таймаута соединения
+        if link.breaker.allow():
+            return False
+        link.commands_failed_fast += 1
+        on_done(CircuitOpen(f'device {link.n} is unreachable, retry in {link.breaker.remaining():.1f} s'))
+        return True
+
+    def _enqueue(self, link, item, on_done):
+        if self._fail_fast(link, on_done):
+            return False
+        try:
+            link.commands.put_nowait(item)
+        except asyncio.QueueFull:
+            link.commands_rejected += 1
+            if self.on_backpressure is not None:
+                self.on_backpressure(link.n, link.commands.qsize())
+            on_done(CommandQueueFull(f'command queue of device {link.n} is full'))
+            return False
+        return True
+
+    def _known(self, n, on_done):
+        link = self.devices.get(n)
+        if link is None:
+            on_done(UnknownDevice(f'device {n} is not polled'))
+        return link
+
+    @staticmethod
+    def _bad_index(link, index, on_done):
+        # Ступень вне кодовой таблицы не должна попасть в обработчик очереди и остановить его
+        if isinstance(index, int) and 0 <= index < link.device.codebook().steps:
+            return False
+        on_done(ValueError(f'step {index!r} is out of range for device {link.n}'))
+        return True
+
+    def submit_setpoint(self, n, index, settle_delay, on_done, trace=None):
+        self.loop.call_soon_threadsafe(self._submit_setpoint, n, index, settle_delay, on_done, trace,
+                                       time.perf_counter())
+
+    def _submit_setpoint(self, n, index, settle_delay, on_done, trace, submitted):
+        link = self._known(n, on_done)
+        if link is None or self._bad_index(link, index, on_done):
+            return
+        # Из нескольких ещё не отправленных уставок записывается только последняя
+        if link.setpoint is not None:
+            link.setpoints_coalesced += 1
+            _, _, replaced_done, replaced = link.setpoint
+            if replaced is not None:
+                replaced.span('queue', replaced.queued)
+                replaced.abort('coalesced')
+            replaced_done(SetpointSuperseded(f'setpoint of device {n} replaced by a newer one'))
+        elif not self._enqueue(link, SETPOINT, on_done):
+            return
+        if trace is not None:
+            trace.queued = submitted
+        link.setpoint = (index, settle_delay, on_done, trace)
+        link.state.target = index
+        self._publish(link)
+
+    def submit_default(self, n, index, on_done):
+        self.loop.call_soon_threadsafe(self._submit_default, n, index, on_done)
+
+    def _submit_default(self, n, index, on_done):
+        link = self._known(n, on_done)
+        if link is not None and not self._bad_index(link, index, on_done):
+            self._enqueue(link, (index, on_done), on_done)
+
+    async def _command_worker(self, link):
+        while True:
+            item = await link.commands.get()
+            if item is SETPOINT:
+                index, settle_delay, on_done, trace = link.setpoint
+                link.setpoint = None
+                if trace is not None:
+                    trace.span('queue', trace.queued)
+            else:
+                trace = None
+                index, on_done = item
+            if self._fail_fast(link, on_done):
+                if item is SETPOINT:
+                    self._setpoint_done(link)
+                    self._publish(link)
+                continue
+            try:
+                if item is SETPOINT:
+                    link.setpoints_sent += 1
+                    result = await self._write_verify(link, link.device.codebook().encode(index), settle_delay, trace)
+                else:
+                    link.commands_sent += 1
+                    result = await link.client.write_multiple_coils(link.device.default_coil,
+                                                                    link.device.codebook().encode(index))
+            except IO_ERRORS as e:
+                link.breaker.failure()
+                result = e
+            except asyncio.CancelledError:
+                # Модуль снят во время записи
+                on_done(UnknownDevice(f'device {link.n} was removed during the write'))
+                raise
+            except Exception as e:
+                # Ошибочная команда завершается ошибкой, обработчик очереди продолжает работу
+                result = e
+            else:
+                link.breaker.success()
+                if item is SETPOINT:
+                    link.state.written(index, result['verified'])
+                    self._await_confirm(link, trace, index)
+                else:
+                    link.state.default_written(index)
+            if item is SETPOINT:
+                self._setpoint_done(link)
+            self._report_breaker(link)
+            self._publish(link)
+            self._poll_soon(link)
+            if trace is not None:
+                trace.done_at = time.perf_counter()
+            on_done(result)
+
+    async def _poll_once(self, link):
+        device = link.device
+        # Катушки текущего ослабления и ослабления по умолчанию читаются одним запросом
+        codebook = device.codebook()
+        bits = codebook.bits
+        first = min(device.att_coil, device.default_coil)
+        count = max(device.att_coil, device.default_coil) + bits - first
+        try:
+            span, checkback_coils = await asyncio.gather(link.client.read_coils(first, count),
+                                                         link.client.read_discrete_inputs(device.checkback_input, bits))
+        except IO_ERRORS:
+            link.poll_failures += 1
+            link.breaker.failure()
+            link.schedule.stable()
+            link.state.poll_failed()
+            if link.confirm is not None:
+                link.confirm[0].abort('unconfirmed')
+                link.confirm = None
+        else:
+            att = codebook.decode(span, device.att_coil - first)
+            default = codebook.decode(span, device.default_coil - first)
+            link.polls += 1
+            link.breaker.success()
+            checkback = codebook.decode(checkback_coils) == att
+            if not checkback:
+                link.checkback_mismatches += 1
+            link.schedule.update((att, default), checkback)
+            link.state.poll_ok(att, default, checkback)
+            if link.confirm is not None and link.confirm[1] == att:
+                trace, _, written = link.confirm
+                link.confirm = None
+                trace.span('poll_confirm', written)
+                trace.done('poll')
+
+    async def _poll_device(self, link):
+        while True:
+            link.wakeup.clear()
+            if link.breaker.allow():
+                await self._poll_once(link)
+                self._report_breaker(link)
+                self._publish(link)
+            try:
+                await asyncio.wait_for(link.wakeup.wait(), max(link.schedule.interval, link.breaker.remaining()))
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self):
+        return self.call(self._stats()).result()
+
+    def metrics(self, bounds):
+        return self.call(self._metrics(bounds)).result()
+
+    async def _metrics(self, bounds):
+        stats = await self._stats()
+        for item in stats:
+            latency = self.devices[item['n']].client.latency
+            item['latency'] = {operation: (histogram.cumulative(bounds), histogram.count, histogram.total / 1e6)
+                               for operation, histogram in latency.items()}
+        return stats
+
+    def latency(self):
+        return self.call(self._latency()).result()
+
+    async def _latency(self):
+        # Копии гистограмм, чтобы поток интерфейса не читал их во время записи
+        return {link.n: {operation: histogram.copy() for operation, histogram in link.client.latency.items()}
+                for link in self.devices.values()}
+
+    async def _stats(self):
+        return [dict(link.client.stats(), n=link.n, polls=link.polls, poll_failures=link.poll_failures,
+                     checkback_mismatches=link.checkback_mismatches, connected=link.state.connected,
+                     setpoints_sent=link.setpoints_sent, setpoints_coalesced=link.setpoints_coalesced,
+                     commands_sent=link.commands_sent, commands_rejected=link.commands_rejected,
+                     commands_failed_fast=link.commands_failed_fast, breaker_state=link.breaker.state,
+                     breaker_opened=link.breaker.opened,
+                     queue_depth=link.commands.qsize(), poll_interval=link.schedule.interval)
+                for link in self.devices.values()]
@@ -0,0 +1,100 @@
+import bisect
+
+
+SUB_BITS = 4
+SUB_BUCKETS = 1 << SUB_BITS
+MAX_BITS = 32
+BUCKETS = (MAX_BITS - SUB_BITS + 1) * SUB_BUCKETS
+
+
+def bucket_index(value):
+    # Лог-линейные корзины: каждый интервал [2^k, 2^(k+1)) мкс делится на SUB_BUCKETS равных частей
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    return min((shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS, BUCKETS - 1)
+
+
+def bucket_bounds(index):
+    if index < SUB_BUCKETS:
+        return index, index + 1
+    shift = index // SUB_BUCKETS - 1
+    lower = (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+    return lower, lower + (1 << shift)
+
+
+UPPER_BOUNDS = [bucket_bounds(index)[1] / 1e6 for index in range(BUCKETS)]
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, seconds):
+        value = int(seconds * 1e6)
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def copy(self):
+        histogram = LatencyHistogram()
+        histogram.merge(self)
+        return histogram
+
+    def percentile(self, q):
+        # Значение в секундах по верхней границе корзины, не больше наблюдавшегося максимума
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bucket_bounds(index)[1], self.max) / 1e6
+        return self.max / 1e6
+
+    def mean(self):
+        return self.total / self.count / 1e6 if self.count else 0
+
+    def summary(self):
+        return {'count': self.count, 'mean': self.mean(), 'p50': self.percentile(50), 'p95': self.percentile(95),
+                'p99': self.percentile(99), 'max': self.max / 1e6}
+
+    def cumulative(self, bounds):
+        # Накопленные количества для заданных границ в секундах (как le у гистограмм Prometheus)
+        result = []
+        seen = 0
+        start = 0
+        for bound in bounds:
+            end = bisect.bisect_right(UPPER_BOUNDS, bound)
+            seen += sum(self.counts[start:end])
+            result.append(seen)
+            start = end
+        return result
+
+    def to_dict(self):
+        return {'counts': [[index, count] for index, count in enumerate(self.counts) if count],
+                'count': self.count, 'total': self.total, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        for index, count in data['counts']:
+            histogram.counts[index] = count
+        histogram.count, histogram.total, histogram.max = data['count'], data['total'], data['max']
+        return histogram
+
+    def buckets(self):
+        return [(bucket_bounds(index)[1] / 1e6, count) for index, count in enumerate(self.counts) if count]
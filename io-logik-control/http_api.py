@@ -0,0 +1,172 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+from control import ControlError, EngineServer
+
+
+# Ограничение тела запроса: групповая уставка для нескольких тысяч модулей занимает десятки килобайт
+MAX_BODY = 1 << 20
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+def to_db(device, index):
+    return None if index is None else device.codebook().to_db(index, device.thru_loss)
+
+
+def device_view(link):
+    # Параметры модуля и его состояние из модели движка; ступени дополнены значениями в дБ
+    device, state = link.device, link.state
+    return device.to_dict() | state.to_dict() | {'att_db': to_db(device, state.att),
+                                                 'default_db': to_db(device, state.default),
+                                                 'setpoint_db': to_db(device, state.setpoint())}
+
+
+class HttpApi(EngineServer):
+    # HTTP/1.1 с постоянными соединениями в цикле событий движка:
+    #   GET  /devices                      -> список модулей с состоянием
+    #   GET  /devices/<n>                  -> модуль с состоянием
+    #   PUT  /devices/<n>/attenuation      {"db": 12.5} -> результат записи и проверки обратной связи
+    #   PUT  /devices/<n>/default          {"db": 12.5}
+    #   POST /setpoints                    {"<n>": <дБ>, ...} -> результаты по модулям
+    #   POST /defaults                     {"<n>": <дБ>, ...}
+    # Групповые записи отправляются во все модули одновременно, ответ приходит после завершения всех записей
+    source = 'http'
+
+    async def _start(self, host, port):
+        self.server = await asyncio.start_server(self._serve, host, port)
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    self._respond(writer, e.status, {'error': e.message}, False)
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                try:
+                    status, result = await self._handle(method, path, body)
+                except HttpError as e:
+                    status, result = e.status, {'error': e.message}
+                self._respond(writer, status, result, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # ValueError — строка запроса или заголовок длиннее буфера чтения
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HttpError(400, 'bad request line')
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HttpError(411, 'chunked request body is not supported, send Content-Length')
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(400, 'bad Content-Length')
+        if length > MAX_BODY:
+            raise HttpError(413, f'request body over {MAX_BODY} bytes')
+        body = await reader.readexactly(length) if length else b''
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method.upper(), target.split('?')[0], body, keep_alive
+
+    def _respond(self, writer, status, result, keep_alive):
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        head = f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n' \
+               f'Content-Type: application/json; charset=utf-8\r\n' \
+               f'Content-Length: {len(body)}\r\n' \
+               f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+        writer.write(head.encode('latin-1') + body)
+
+    async def _handle(self, method, path, body):
+        parts = path.strip('/').split('/')
+        if parts == ['devices']:
+            self._allow(method, 'GET')
+            return 200, [device_view(link) for link in self.engine.devices.values()]
+        if len(parts) == 2 and parts[0] == 'devices':
+            self._allow(method, 'GET')
+            return 200, device_view(self._http_link(parts[1], 404))
+        if len(parts) == 3 and parts[0] == 'devices' and parts[2] in ('attenuation', 'default'):
+            self._allow(method, 'PUT')
+            link = self._http_link(parts[1], 404)
+            data = self._json(body)
+            if not isinstance(data, dict) or 'db' not in data:
+                raise HttpError(400, 'expected {"db": <value>}')
+            result = (await self._write({link.n: data['db']}, parts[2] == 'attenuation'))[str(link.n)]
+            return 502 if 'error' in result else 200, result
+        if parts in (['setpoints'], ['defaults']):
+            self._allow(method, 'POST')
+            data = self._json(body)
+            if not isinstance(data, dict):
+                raise HttpError(400, 'expected {"<n>": <db>, ...}')
+            results = await self._write(data, parts == ['setpoints'])
+            return 200, {'results': results, 'failed': sum('error' in result for result in results.values())}
+        raise HttpError(404, f'no resource {path}')
+
+    @staticmethod
+    def _allow(method, allowed):
+        if method != allowed:
+            raise HttpError(405, f'use {allowed}')
+
+    @staticmethod
+    def _json(body):
+        try:
+            return json.loads(body or b'null')
+        except ValueError as e:
+            raise HttpError(400, f'bad JSON: {e}')
+
+    def _http_link(self, n, status):
+        try:
+            return self._link(n)
+        except (ControlError, ValueError):
+            raise HttpError(status, f'unknown device {n}')
+
+    async def _write(self, values, setpoint):
+        # Все значения проверяются до отправки: запрос с ошибкой не выполняется частично
+        targets = []
+        for n, db in values.items():
+            link = self._http_link(n, 400)
+            if isinstance(db, bool) or not isinstance(db, (int, float)):
+                raise HttpError(400, f'attenuation {db!r} for device {link.n} is not a number')
+            try:
+                targets.append((link, self._index(link, db)))
+            except ValueError:
+                raise HttpError(400, f'attenuation {db!r} is out of range for device {link.n}')
+        submit = self._setpoint if setpoint else self._default
+        results = await asyncio.gather(*[submit(link, index, lambda result, link=link, index=index:
+                                                self._result(link, index, result)) for link, index in targets])
+        return {str(link.n): result for (link, _), result in zip(targets, results)}
+
+    @staticmethod
+    def _result(link, index, result):
+        if isinstance(result, Exception):
+            return {'error': repr(result)}
+        response = {'db': to_db(link.device, index)}
+        if isinstance(result, dict) and 'verified' in result:
+            response.update(verified=result['verified'], latency=round(result['latency'], 6))
+        return response
@@ -0,0 +1,175 @@
+import argparse
+import datetime
+import glob
+import json
+import os
+
+
+# Журнал событий: по файлу <дата>.jsonl на сутки и индекс <дата>.idx.jsonl рядом с ним.
+# Строка индекса описывает байтовый диапазон событий одного модуля за один временной блок.
+class Journal:
+    def __init__(self, directory, block_seconds=600):
+        self.directory = directory
+        self.block_seconds = block_seconds
+        self.date = None
+        self.file = None
+        self.index_file = None
+        self.offset = 0
+        self.block = None
+        self.spans = {}
+
+    def append(self, wall, monotonic, event, device=None, values=None):
+        self._rollover(datetime.date.fromtimestamp(wall))
+        block = int(wall // self.block_seconds) * self.block_seconds
+        if block != self.block:
+            self._write_index()
+            self.block = block
+        record = {'ts': round(wall, 3), 'mono': round(monotonic, 6), 'event': event, 'device': device}
+        if values:
+            record.update(values)
+        data = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        start = self.offset
+        self.file.write(data)
+        self.offset += len(data)
+        span = self.spans.get(device)
+        if span is None:
+            self.spans[device] = [start, self.offset, 1]
+        else:
+            span[1] = self.offset
+            span[2] += 1
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self._write_index()
+            self.file.close()
+            self.index_file.close()
+            self.file = self.index_file = self.date = self.block = None
+
+    def _rollover(self, date):
+        if date == self.date:
+            return
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)
+        name = os.path.join(self.directory, date.strftime('%Y%m%d'))
+        self.file = open(f'{name}.jsonl', 'ab')
+        self.index_file = open(f'{name}.idx.jsonl', 'a')
+        self.offset = self.file.tell()
+        self.date = date
+        self._recover(name)
+
+    def _recover(self, name):
+        # Прошлый запуск, завершённый без close (сбой, SIGKILL, отключение питания), оставляет последний блок
+        # без индекса; после новых записей запрос его бы уже не увидел, поэтому он индексируется при открытии
+        tail = max((entry['end'] for entry in _read_index(f'{name}.idx.jsonl')), default=0)
+        if self.offset <= tail:
+            return
+        with open(f'{name}.jsonl', 'rb') as f:
+            f.seek(tail)
+            data = f.read(self.offset - tail)
+        # Недописанная последняя строка отбрасывается
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            self.file.truncate(tail + complete)
+            self.offset = tail + complete
+        spans = {}
+        position = tail
+        for line in data[:complete].splitlines(keepends=True):
+            start, position = position, position + len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            key = int(record['ts'] // self.block_seconds) * self.block_seconds, record['device']
+            span = spans.get(key)
+            if span is None:
+                spans[key] = [start, position, 1]
+            else:
+                span[1] = position
+                span[2] += 1
+        for (block, device), (start, end, count) in spans.items():
+            self.index_file.write(json.dumps({'block': block, 'device': device,
+                                              'start': start, 'end': end, 'count': count}) + '\n')
+        self.index_file.flush()
+
+    def _write_index(self):
+        # Блок индексируется при переходе к следующему блоку; незакрытый хвост файла запрос читает целиком
+        for device, (start, end, count) in self.spans.items():
+            self.index_file.write(json.dumps({'block': self.block, 'device': device,
+                                              'start': start, 'end': end, 'count': count}) + '\n')
+        self.index_file.flush()
+        self.spans = {}
+
+
+def _read_index(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _merge(spans):
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def query(directory, device=None, event=None, start=None, end=None, block_seconds=600):
+    start_date = datetime.date.fromtimestamp(start) if start is not None else None
+    end_date = datetime.date.fromtimestamp(end) if end is not None else None
+    for path in sorted(glob.glob(os.path.join(directory, '*.jsonl'))):
+        name = os.path.basename(path)[:-len('.jsonl')]
+        if not name.isdigit():
+            continue
+        date = datetime.datetime.strptime(name, '%Y%m%d').date()
+        if (start_date is not None and date < start_date) or (end_date is not None and date > end_date):
+            continue
+
+        entries = _read_index(os.path.join(directory, f'{name}.idx.jsonl'))
+        spans = [(entry['start'], entry['end']) for entry in entries
+                 if (device is None or entry['device'] == device) and
+                 (start is None or entry['block'] + block_seconds > start) and
+                 (end is None or entry['block'] <= end)]
+        tail = max((entry['end'] for entry in entries), default=0)
+
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            spans = _merge(spans + [(tail, f.tell())])
+            for span_start, span_end in spans:
+                f.seek(span_start)
+                for line in f.read(span_end - span_start).splitlines():
+                    record = json.loads(line)
+                    if device is not None and record['device'] != device:
+                        continue
+                    if event is not None and record['event'] != event:
+                        continue
+                    if (start is not None and record['ts'] < start) or (end is not None and record['ts'] > end):
+                        continue
+                    yield record
+
+
+def _timestamp(text):
+    return datetime.datetime.fromisoformat(text).timestamp() if text else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Выборка событий из журнала ioLogik')
+    parser.add_argument('--dir', default='ioLogik_logs')
+    parser.add_argument('--device', type=int)
+    parser.add_argument('--event')
+    parser.add_argument('--from', dest='start', help='начало, например 2026-10-13 или 2026-10-13T08:00')
+    parser.add_argument('--to', dest='end')
+    args = parser.parse_args()
+    for record in query(args.dir, args.device, args.event, _timestamp(args.start), _timestamp(args.end)):
+        print(json.dumps(record, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
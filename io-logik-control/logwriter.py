@@ -0,0 +1,114 @@
+import datetime
+import os
+import queue
+import threading
+import time
+
+
+STOP = object()
+
+
+class LogWriter:
+    def __init__(self, directory, journal=None, queue_size=10000, batch_size=500, flush_interval=1):
+        self.directory = directory
+        self.journal = journal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(queue_size)
+        self.written = 0
+        self.dropped = 0
+        self.reported_dropped = 0
+        self.date = None
+        self.file = None
+        self.flushed_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='LogWriter', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread.is_alive():
+            return
+        self.queue.put(STOP)
+        self._thread.join()
+
+    def write(self, text):
+        # Вызывающий поток только ставит запись в очередь; при переполнении запись отбрасывается
+        try:
+            self.queue.put_nowait((datetime.datetime.now(), text))
+        except queue.Full:
+            self.dropped += 1
+
+    def event(self, event, device=None, **values):
+        if self.journal is None:
+            return
+        try:
+            self.queue.put_nowait((time.time(), time.monotonic(), event, device, values))
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self):
+        return {'written': self.written, 'dropped': self.dropped, 'queued': self.queue.qsize()}
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._flush()
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = STOP in batch
+            self._write_batch([entry for entry in batch if entry is not STOP])
+            if stop:
+                self._close()
+                return
+            # Файл сбрасывается на диск не чаще раза в flush_interval секунд или при простое очереди
+            if time.monotonic() - self.flushed_at >= self.flush_interval:
+                self._flush()
+
+    def _write_batch(self, batch):
+        for entry in batch:
+            if len(entry) == 5:
+                self.journal.append(*entry)
+                continue
+            date_time, text = entry
+            self._rollover(date_time)
+            self.file.write(f'[{date_time.strftime("%d.%m.%Y %H:%M:%S")}.{date_time.microsecond // 1000:03d}] - {text}\n')
+        self.written += len(batch)
+        if self.dropped != self.reported_dropped and self.file is not None:
+            self.file.write(f'[{datetime.datetime.now().strftime("%d.%m.%Y %H:%M:%S")}] - '
+                            f'Очередь журнала переполнена, отброшено записей: {self.dropped - self.reported_dropped}.\n')
+            self.reported_dropped = self.dropped
+
+    def _flush(self):
+        if self.file is not None:
+            self.file.flush()
+        if self.journal is not None:
+            self.journal.flush()
+        self.flushed_at = time.monotonic()
+
+    def _rollover(self, date_time):
+        # Новый файл открывается один раз при смене суток
+        date = date_time.date()
+        if date == self.date:
+            return
+        self._close_file()
+        os.makedirs(self.directory, exist_ok=True)
+        self.file = open(os.path.join(self.directory, f'{date.strftime("%Y%m%d")}.txt'), 'a')
+        self.date = date
+
+    def _close(self):
+        if self.journal is not None:
+            self.journal.close()
+        self._close_file()
+
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.date = None
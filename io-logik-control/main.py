@@ -1,23 +1,37 @@
 import sys
+import argparse
+import asyncio
 import os
 import traceback
 import datetime
-import time
+import json
 import re
-import threading
 import psutil
-from numpy import arange
 
 from PyQt5 import QtWidgets, QtGui
-from PyQt5.QtCore import Qt, QSettings, QCoreApplication, QSize, QThread, pyqtSignal
-from pyModbusTCP.client import ModbusClient
-
+from PyQt5.QtCore import Qt, QSettings, QCoreApplication, QSize, QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QHeaderView
 import main_window_gui
 import change_ip_gui
 import settings_gui
 import about_gui
 import instruction_gui
+import diagnostics_gui
 import stylesheets
+from devices import Device, DeviceRegistry, DEFAULT_DEVICES
+from engine import IoEngine
+from daemon import DEFAULT_PORT
+from daemon_client import DaemonClient, DaemonError
+from control import ControlServer
+from scpi import ScpiServer
+from http_api import HttpApi
+from logwriter import LogWriter
+from journal import Journal
+from metrics import MetricsServer, collect
+from monitor import ResourceMonitor
+from profiler import Profiler, SAMPLING, DETERMINISTIC
+from tracing import Tracer, finish_setpoint, journal_trace
+from channel_model import ChannelTableModel, AttenuationDelegate, COLUMN_NAME, COLUMN_IP, COLUMN_ATT
 
 
 QCoreApplication.setOrganizationName('Maslov')
@@ -27,22 +41,61 @@ QCoreApplication.setOrganizationDomain('ksmaslov@mail.ru')
 N_SET = 0
 
 SETTINGS = QSettings()
-IP = [SETTINGS.value('IP_1', '192.168.10.84', str), SETTINGS.value('IP_2', '192.168.10.85', str)]
-THRU_LOSS = [SETTINGS.value('thru_loss_1', 4.5, float), SETTINGS.value('thru_loss_2', 4.5, float)]
 LOGGING = bool(SETTINGS.value('logging', False, bool))
+CHECKBACK_DELAY = SETTINGS.value('checkback_delay', 100, int)
+POLL_MIN = SETTINGS.value('poll_min', 0.5, float)
+POLL_MAX = SETTINGS.value('poll_max', 5, float)
 STYLE = SETTINGS.value('style', 'Dark Orange', str)
+METRICS_PORT = SETTINGS.value('metrics_port', 0, int)
+# Метрики без проверки доступа отдаются только на этот ПК; 0.0.0.0 — для сбора сервером Prometheus по сети
+METRICS_HOST = SETTINGS.value('metrics_host', '127.0.0.1', str)
+MONITOR_INTERVAL = SETTINGS.value('monitor_interval', 60, float)
+MONITOR_SAMPLES = SETTINGS.value('monitor_samples', 1440, int)
+RESOURCE_LOG_INTERVAL = 600
+
+
+def load_devices():
+    devices = SETTINGS.value('devices', '', str)
+    if devices:
+        return DeviceRegistry.from_json(devices)
+    # Перенос настроек двух комплектов из предыдущих версий программы
+    return DeviceRegistry.from_list(
+        [dict(device, host=SETTINGS.value(f'IP_{device["id"]}', device['host'], str),
+              thru_loss=SETTINGS.value(f'thru_loss_{device["id"]}', 4.5, float)) for device in DEFAULT_DEVICES])
+
+
+DEVICES = load_devices()
+ENGINE = IoEngine(poll_min=POLL_MIN, poll_max=POLL_MAX, timeout=2)
+LOG = LogWriter('ioLogik_logs', Journal('ioLogik_logs'))
+LOG.start()
+METRICS = None
+MONITOR = ResourceMonitor(MONITOR_INTERVAL, MONITOR_SAMPLES)
+# Полное профилирование включается в потоке интерфейса и в потоке движка опроса;
+# поток интерфейса простаивает в app.exec(), когда на вершине стека функция main
+PROFILER = Profiler('ioLogik_logs', {'MainThread': lambda func: func(), 'IoEngine': lambda func: ENGINE.invoke(func)},
+                    idle=['main (main.py'])
+LAST_RESOURCE_LOG = 0
+# Адрес службы daemon.py, к которой подключён интерфейс; None — опрос выполняется в самой программе
+ATTACH = None
+# Файл списка модулей из --devices; такой список не сохраняется в настройки вместо списка оборудования
+DEVICES_FILE = None
+CONTROL = None
+SCPI = None
+HTTP_API = None
+TRACER = Tracer()
 
 
-LOCK = threading.Lock()
+def logging(text):
+    if LOGGING:
+        LOG.write(text)
 
 
-def logging(text):
+def journal(event, device=None, **values):
     if LOGGING:
-        date_time = datetime.datetime.now()
-        date = date_time.strftime('%Y%m%d')
-        date_time = date_time.strftime(f'%d.%m.%Y %H:%M:%S.{str(date_time.microsecond // 1000).rjust(3, "0")}')
-        with open(os.path.join('ioLogik_logs', f'{date}.txt'), 'a') as log_file:
-            log_file.write(f'[{date_time}] - {text}\n')
+        LOG.event(event, device, **values)
+
+
+TRACER.on_finish = lambda trace: journal_trace(journal, trace)
 
 
 def check_logging_dir():
@@ -58,6 +111,7 @@ def log_uncaught_exceptions(ex_cls, ex, tb):
     error += ''.join(traceback.format_tb(tb))
     print(error)
     logging(error)
+    LOG.stop()
     QtWidgets.QMessageBox.critical(None, 'Error', f'Непредвиденная ошибка!\n\n{error}')
     sys.exit()
 
@@ -84,11 +138,44 @@ def check_duplicates():
     SETTINGS.setValue('pid', os.getpid())
 
 
-def memory_control():
-    while True:
-        time.sleep(600)
-        mem_info = psutil.Process().memory_info()
-        logging(f'Используется памяти: {mem_info[0]}({mem_info[3]}) байт')
+def log_resources(sample):
+    global LAST_RESOURCE_LOG
+    if sample['time'] - LAST_RESOURCE_LOG < RESOURCE_LOG_INTERVAL:
+        return
+    LAST_RESOURCE_LOG = sample['time']
+    logging(f'Используется памяти: {sample["rss"]}({sample["uss"]}) байт, дескрипторов {sample["fds"]}, '
+            f'сокетов {sample["sockets"]}, потоков {sample["threads"]}, объектов Qt {sample["qt_objects"]}.')
+    log_engine_stats()
+
+
+def log_growth(key, first, last):
+    logging(f'Внимание: монотонный рост {key} за {MONITOR.growth_samples} замеров: {first} -> {last}.')
+
+
+def log_engine_stats():
+    for stats in ENGINE.stats():
+        logging(f'[{stats["n"]}К] Соединение {stats["host"]}: открытий {stats["opens"]}, '
+                f'переподключений {stats["reconnects"]}, повторных использований {stats["reuses"]}, ошибок {stats["failures"]}; '
+                f'уставок отправлено {stats["setpoints_sent"]}, объединено {stats["setpoints_coalesced"]}; '
+                f'команд отправлено {stats["commands_sent"]}, отклонено {stats["commands_rejected"]}, '
+                f'сброшено без отправки {stats["commands_failed_fast"]}, '
+                f'в очереди {stats["queue_depth"]}; период опроса {stats["poll_interval"]:.1f} с.')
+
+
+def start_metrics(host, port):
+    global METRICS
+    if METRICS is not None:
+        METRICS.stop()
+        METRICS = None
+    if port:
+        try:
+            METRICS = MetricsServer(port, lambda: collect(ENGINE, LOG), host)
+        except OSError as e:
+            logging(f'Не удалось открыть порт метрик {host}:{port}: {e!r}.')
+            return
+        METRICS.start()
+        address = '<адрес ПК>' if host in ('0.0.0.0', '::') else host
+        logging(f'Метрики доступны по адресу http://{address}:{port}/metrics.')
 
 
 class IoLogikControl(QtWidgets.QMainWindow):
@@ -103,63 +190,42 @@ class IoLogikControl(QtWidgets.QMainWindow):
                             Qt.WindowMinimizeButtonHint)
         # self.setWindowFlags(Qt.FramelessWindowHint)
 
-        for item in arange(THRU_LOSS[0], 32 + THRU_LOSS[0], 0.5):
-            self.ui.comboBox_1.addItem(f'{str(item)} дБ', item)
-        for item in arange(THRU_LOSS[1], 32 + THRU_LOSS[1], 0.5):
-            self.ui.comboBox_2.addItem(f'{str(item)} дБ', item)
-        self.ui.pushButton_def_1.setText(f'По умолчанию: {THRU_LOSS[0]} дБ')
-        self.ui.pushButton_def_2.setText(f'По умолчанию: {THRU_LOSS[1]} дБ')
-
-        self.cb_color = 'black'
-
-        self.ui.pushButton_minus_1.clicked.connect(lambda: self.att_plus_minus(1, -1))
-        self.ui.pushButton_plus_1.clicked.connect(lambda: self.att_plus_minus(1, 1))
-        self.ui.pushButton_minus_2.clicked.connect(lambda: self.att_plus_minus(2, -1))
-        self.ui.pushButton_plus_2.clicked.connect(lambda: self.att_plus_minus(2, 1))
-
-        self.ui.pushButton_minus_1.setIcon(QtGui.QIcon(':/icons/icons/minus.png'))
-        self.ui.pushButton_minus_2.setIcon(QtGui.QIcon(':/icons/icons/minus.png'))
-        self.ui.pushButton_plus_1.setIcon(QtGui.QIcon(':/icons/icons/plus.png'))
-        self.ui.pushButton_plus_2.setIcon(QtGui.QIcon(':/icons/icons/plus.png'))
-
-        self.ui.pushButton_minus_1.pressed.connect(lambda: self.ui.pushButton_minus_1.setIconSize(QSize(16, 16)))
-        self.ui.pushButton_minus_1.released.connect(lambda: self.ui.pushButton_minus_1.setIconSize(QSize(18, 18)))
-        self.ui.pushButton_minus_2.pressed.connect(lambda: self.ui.pushButton_minus_2.setIconSize(QSize(16, 16)))
-        self.ui.pushButton_minus_2.released.connect(lambda: self.ui.pushButton_minus_2.setIconSize(QSize(18, 18)))
-        self.ui.pushButton_plus_1.pressed.connect(lambda: self.ui.pushButton_plus_1.setIconSize(QSize(16, 16)))
-        self.ui.pushButton_plus_1.released.connect(lambda: self.ui.pushButton_plus_1.setIconSize(QSize(18, 18)))
-        self.ui.pushButton_plus_2.pressed.connect(lambda: self.ui.pushButton_plus_2.setIconSize(QSize(16, 16)))
-        self.ui.pushButton_plus_2.released.connect(lambda: self.ui.pushButton_plus_2.setIconSize(QSize(18, 18)))
-
-        self.set_current_att_1 = SetAttenuation(target=self.set_att, args=[1, 'current'])
-        self.set_current_att_2 = SetAttenuation(target=self.set_att, args=[2, 'current'])
-        self.to_default_att_1 = SetAttenuation(target=self.set_att, args=[1, 'to_default'])
-        self.to_default_att_2 = SetAttenuation(target=self.set_att, args=[2, 'to_default'])
-        self.set_default_att_1 = SetAttenuation(target=self.set_att, args=[1, 'set_default'])
-        self.set_default_att_2 = SetAttenuation(target=self.set_att, args=[2, 'set_default'])
-
-        self.ui.comboBox_1.currentIndexChanged.connect(self.set_current_att_1.start)
-        self.ui.comboBox_2.currentIndexChanged.connect(self.set_current_att_2.start)
-        self.ui.pushButton_def_1.clicked.connect(self.to_default_att_1.start)
-        self.ui.pushButton_def_2.clicked.connect(self.to_default_att_2.start)
-        self.ui.pushButton_set_def_1.clicked.connect(self.set_default_att_1.start)
-        self.ui.pushButton_set_def_2.clicked.connect(self.set_default_att_2.start)
-
-        self.ui.pushButton_ip_1.clicked.connect(lambda: self.change_ip(1))
-        self.ui.pushButton_ip_2.clicked.connect(lambda: self.change_ip(2))
+        self.model = ChannelTableModel(self)
+        self.model.attenuation_edited.connect(self.set_current_att)
+        table = self.ui.tableView_channels
+        table.setModel(self.model)
+        table.setItemDelegateForColumn(COLUMN_ATT, AttenuationDelegate(table))
+        # Строки фиксированной высоты позволяют виду отрисовывать только видимую часть таблицы
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.verticalHeader().setDefaultSectionSize(30)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        for column, width in enumerate([140, 220, 130, 130]):
+            table.setColumnWidth(column, width)
+        table.doubleClicked.connect(self.table_double_clicked)
+
+        self.ui.pushButton_minus.clicked.connect(lambda: self.att_plus_minus(-1))
+        self.ui.pushButton_plus.clicked.connect(lambda: self.att_plus_minus(1))
+        self.ui.pushButton_def.clicked.connect(lambda: self.set_att('to_default'))
+        self.ui.pushButton_set_def.clicked.connect(lambda: self.set_att('set_default'))
+        self.ui.pushButton_ip.clicked.connect(self.change_selected_ip)
 
         self.app_about = AboutWidget()
         self.app_instruction = InstructionWidget()
 
+        self.app_diagnostics = DiagnosticsWidget()
+        self.app_diagnostics.ui.pushButton_latency_refresh.clicked.connect(self.show_latency)
+        self.app_diagnostics.ui.pushButton_latency_export.clicked.connect(self.export_latency)
+        self.app_diagnostics.ui.pushButton_resources_refresh.clicked.connect(self.show_resources)
+        self.app_diagnostics.ui.pushButton_snapshot.clicked.connect(self.memory_snapshot)
+        self.app_diagnostics.ui.pushButton_traces_refresh.clicked.connect(self.show_traces)
+
         self.app_change_ip = ChangeIP()
         self.app_change_ip.ui.pushButton_OK.clicked.connect(self.set_ip)
 
         self.app_settings = SettingsWidget()
-        self.app_settings.ui.lineEdit_ip_1.setText(IP[0])
-        self.app_settings.ui.lineEdit_ip_2.setText(IP[1])
-        self.app_settings.ui.lineEdit_tl_1.setText(str(THRU_LOSS[0]))
-        self.app_settings.ui.lineEdit_tl_2.setText(str(THRU_LOSS[1]))
         self.app_settings.ui.checkBox_logs.setChecked(LOGGING)
+        self.app_settings.ui.pushButton_add.clicked.connect(self.app_settings.add_device_row)
+        self.app_settings.ui.pushButton_remove.clicked.connect(self.app_settings.remove_device_rows)
         self.app_settings.ui.pushButton_cancel.clicked.connect(self.app_settings.close)
         self.app_settings.ui.pushButton_save.clicked.connect(self.set_settings)
 
@@ -167,32 +233,86 @@ class IoLogikControl(QtWidgets.QMainWindow):
         self.app_settings.ui.comboBox_style.currentIndexChanged.connect(self.change_style)
         self.app_settings.ui.comboBox_style.setCurrentText(STYLE)
 
-        self.change_style()
-
-        self.ui.action_settings.triggered.connect(self.app_settings.show)
+        self.ui.action_settings.triggered.connect(self.show_settings)
         self.ui.action_exit.triggered.connect(self.close)
         self.ui.action_about.triggered.connect(self.app_about.show)
         self.ui.action_instruction.triggered.connect(self.app_instruction.show)
+        self.ui.action_latency.triggered.connect(self.show_latency)
+        self.ui.action_resources.triggered.connect(self.show_resources)
+        self.ui.action_traces.triggered.connect(self.show_traces)
+        self.ui.action_profile_sampling.toggled.connect(lambda checked: self.toggle_profiler(SAMPLING, checked))
+        self.ui.action_profile_deterministic.toggled.connect(
+            lambda checked: self.toggle_profiler(DETERMINISTIC, checked))
+
+        self.engine_bridge = EngineBridge()
+        self.engine_bridge.signal_state.connect(self.state_resp)
+        self.engine_bridge.signal_setpoint.connect(self.setpoint_resp)
+        self.engine_bridge.signal_default.connect(self.default_resp)
+        self.engine_bridge.signal_backpressure.connect(self.backpressure_resp)
+        self.engine_bridge.signal_breaker.connect(self.breaker_resp)
+        ENGINE.on_state = self.engine_bridge.signal_state.emit
+        ENGINE.on_backpressure = self.engine_bridge.signal_backpressure.emit
+        ENGINE.on_breaker = self.engine_bridge.signal_breaker.emit
+        ENGINE.start()
+        start_metrics(METRICS_HOST, METRICS_PORT)
+
+        for device in DEVICES:
+            self.add_device(device)
+        self.change_style()
 
-        self.ui.pushButton_ip_1.setText(f'         IP: {IP[0]}    ')
-        self.ui.pushButton_ip_2.setText(f'         IP: {IP[1]}    ')
-
-        self.status = [0, 0]
-        self.coils = [[], []]
-
-        self.connection_1 = ConnectionThread(1)
-        self.connection_2 = ConnectionThread(2)
-        self.connection_1.signal_connect.connect(self.connection_resp)
-        self.connection_2.signal_connect.connect(self.connection_resp)
-        self.connection_1.start()
-        self.connection_2.start()
-
-        threading.Thread(target=memory_control, daemon=True).start()
+        MONITOR.on_sample = log_resources
+        MONITOR.on_growth = log_growth
+        self.count_qt_objects()
+        self.qt_objects_timer = QTimer(self)
+        self.qt_objects_timer.timeout.connect(self.count_qt_objects)
+        self.qt_objects_timer.start(int(MONITOR_INTERVAL * 1000))
+        MONITOR.start()
+
+    def count_qt_objects(self):
+        # Считается в потоке интерфейса, монитор ресурсов только читает значение. Каждый объект учитывается
+        # один раз: окна верхнего уровня с их потомками и объекты, принадлежащие самому приложению
+        app = QtWidgets.QApplication.instance()
+        MONITOR.qt_objects = len(app.findChildren(QObject)) + sum(
+            1 + len(widget.findChildren(QObject)) for widget in app.topLevelWidgets())
+
+    def add_device(self, device):
+        self.model.add_channel(device)
+        ENGINE.add_device(device)
+
+    def remove_device(self, n):
+        ENGINE.remove_device(n)
+        self.model.remove_channel(n)
+
+    def selected_ids(self):
+        rows = sorted(index.row() for index in self.ui.tableView_channels.selectionModel().selectedRows())
+        return [self.model.state_at(row).n for row in rows]
+
+    def table_double_clicked(self, index):
+        if index.column() in (COLUMN_NAME, COLUMN_IP):
+            self.change_ip(self.model.state_at(index.row()).n)
 
     def closeEvent(self, event):
         SETTINGS.setValue('pid', 0)
 
+        log_engine_stats()
+        if PROFILER.active is not None:
+            path, _ = PROFILER.stop()
+            logging(f'Профилирование завершено, результат: {path}.')
+        start_metrics(METRICS_HOST, 0)
+        MONITOR.stop()
+        MONITOR.stop_tracing()
+        if CONTROL is not None:
+            CONTROL.stop().result()
+        if SCPI is not None:
+            SCPI.stop().result()
+        if HTTP_API is not None:
+            HTTP_API.stop().result()
+        ENGINE.stop()
+        log_stats = LOG.stats()
+        logging(f'Журнал: записано {log_stats["written"]}, отброшено {log_stats["dropped"]}.')
         logging('Работа программы завершена.')
+        journal('stop')
+        LOG.stop()
 
     def change_style(self):
         global STYLE
@@ -200,11 +320,8 @@ class IoLogikControl(QtWidgets.QMainWindow):
         STYLE = style
         if style == 'Dark Orange':
             self.setStyleSheet(stylesheets.dark_orange_stylesheet)
-            self.cb_color = '#b1b1b1'
-            self.ui.pushButton_minus_1.setIcon(QtGui.QIcon(':/icons/icons/minus.png'))
-            self.ui.pushButton_minus_2.setIcon(QtGui.QIcon(':/icons/icons/minus.png'))
-            self.ui.pushButton_plus_1.setIcon(QtGui.QIcon(':/icons/icons/plus.png'))
-            self.ui.pushButton_plus_2.setIcon(QtGui.QIcon(':/icons/icons/plus.png'))
+            self.ui.pushButton_minus.setIcon(QtGui.QIcon(':/icons/icons/minus.png'))
+            self.ui.pushButton_plus.setIcon(QtGui.QIcon(':/icons/icons/plus.png'))
 
             self.app_settings.setStyleSheet(stylesheets.dark_orange_stylesheet + 'QWidget {font-size: 10pt;}')
 
@@ -215,13 +332,12 @@ class IoLogikControl(QtWidgets.QMainWindow):
             self.app_instruction.setStyleSheet(stylesheets.dark_orange_stylesheet + 'QWidget {font-size: 10pt;}')
             self.app_instruction.ui.label.setStyleSheet('font-size: 12pt')
 
+            self.app_diagnostics.setStyleSheet(stylesheets.dark_orange_stylesheet + 'QWidget {font-size: 10pt;}')
+
         elif style == 'Classic':
             self.setStyleSheet('')
-            self.cb_color = 'black'
-            self.ui.pushButton_minus_1.setIcon(QtGui.QIcon(':/icons/icons/minus_black.png'))
-            self.ui.pushButton_minus_2.setIcon(QtGui.QIcon(':/icons/icons/minus_black.png'))
-            self.ui.pushButton_plus_1.setIcon(QtGui.QIcon(':/icons/icons/plus_black.png'))
-            self.ui.pushButton_plus_2.setIcon(QtGui.QIcon(':/icons/icons/plus_black.png'))
+            self.ui.pushButton_minus.setIcon(QtGui.QIcon(':/icons/icons/minus_black.png'))
+            self.ui.pushButton_plus.setIcon(QtGui.QIcon(':/icons/icons/plus_black.png'))
 
             self.app_settings.setStyleSheet('QWidget {font-size: 10pt;}')
 
@@ -232,74 +348,94 @@ class IoLogikControl(QtWidgets.QMainWindow):
             self.app_instruction.setStyleSheet('QWidget {font-size: 10pt;}')
             self.app_instruction.ui.label.setStyleSheet('font-size: 12pt')
 
+            self.app_diagnostics.setStyleSheet('QWidget {font-size: 10pt;}')
+
     def change_icon_size(self, button, size):
         button.setIconSize(QSize(size, size))
 
-    def connection_resp(self, n, status, coils_int, checkback):
-        pushButtons_def = [self.ui.pushButton_def_1, self.ui.pushButton_def_2]
-        pushButtons_ip = [self.ui.pushButton_ip_1, self.ui.pushButton_ip_2]
-        comboBoxes = [self.ui.comboBox_1, self.ui.comboBox_2]
-        icons = [QtGui.QIcon(':/icons/icons/led_red.png'), QtGui.QIcon(':/icons/icons/led_green.png')]
+    def state_resp(self, n, state):
+        old = self.model.state(n)
+        if old is None:
+            return
         con_log = ['потеряно', 'установлено']
-        styles = ['QComboBox {color: red}', 'QComboBox {color: ' + self.cb_color + '}']
-
-        comboBoxes[n - 1].setStyleSheet(styles[checkback])
-
-        if status != self.status[n - 1]:
-            self.status[n - 1] = status
-            pushButtons_ip[n - 1].setIcon(icons[status])
-            if status:
-                self.coils[n - 1] = coils_int
-                att_current = abs(int(''.join(map(str, reversed(coils_int[0:6]))), 2) - 63) / 2
-                att_default = abs(int(''.join(map(str, reversed(coils_int[6:]))), 2) - 63) / 2
-                if comboBoxes[n - 1].currentData() != att_current + THRU_LOSS[n - 1]:
-                    comboBoxes[n - 1].setCurrentText(f'{att_current + THRU_LOSS[n - 1]} дБ')
-                    pushButtons_def[n - 1].setText(f'По умолчанию: {att_default + THRU_LOSS[n - 1]} дБ')
-
-            logging(f'[{n}К] Соединение {con_log[status]} (IP: {IP[n - 1]}).')
-
-    def set_att(self, n, mode):
-        with LOCK:
-            global IP
-            host = [IP[0], IP[1]]
-            comboBoxes = [self.ui.comboBox_1, self.ui.comboBox_2]
-            pushButtons_def = [self.ui.pushButton_def_1, self.ui.pushButton_def_2]
-
-            att_pattern = r'[\d|\.]{3,4}'
-            att_def = float(re.findall(att_pattern, pushButtons_def[n - 1].text())[0])
-            att = comboBoxes[n - 1].currentData()
-
-            if self.status[n - 1]:
-                if mode == 'current':
-                    coils = list(map(int, list(f'{63 - int((att - THRU_LOSS[n - 1]) * 2):06b}'[::-1])))
-                    c = ModbusClient(host=host[n - 1], auto_open=True, auto_close=True, timeout=1)
-                    c.write_multiple_coils(0, coils)
-
-                    logging(f'[{n}К] Задано ослабление {att} дБ.')
-                elif mode == 'to_default':
-                    comboBoxes[n - 1].setCurrentText(f'{att_def} дБ')
-                elif mode == 'set_default':
-                    coils = list(map(int, list(f'{63 - int((att - THRU_LOSS[n - 1]) * 2):06b}'[::-1])))
-                    c = ModbusClient(host=host[n - 1], auto_open=True, auto_close=True, timeout=1)
-                    pushButtons_def[n - 1].setText(f'По умолчанию: {att} дБ')
-                    c.write_multiple_coils(6, coils)
-
-                    logging(f'[{n}К] Задано ослабление по умолчанию {att} дБ.')
-
-    def att_plus_minus(self, n, step):
-        buttons = [self.ui.comboBox_1, self.ui.comboBox_2]
-        next_index = buttons[n - 1].currentIndex() + step
-        if next_index in range(0, 64):
-            buttons[n - 1].setCurrentIndex(next_index)
+
+        self.model.set_state(n, state)
+
+        if state.connected != old.connected:
+            logging(f'[{n}К] Соединение {con_log[state.connected]} (IP: {state.device.host}).')
+            journal('connection', n, connected=state.connected, host=state.device.host)
+
+    def breaker_resp(self, n, state):
+        if self.model.state(n) is None:
+            return
+        states_log = {'closed': 'замкнута', 'open': 'разомкнута', 'half_open': 'полуразомкнута'}
+
+        logging(f'[{n}К] Цепь защиты соединения {states_log[state]} (IP: {DEVICES[n].host}).')
+        journal('breaker', n, state=state)
+
+    def set_current_att(self, n):
+        state = self.model.state(n)
+        index = state.target
+
+        if state.connected and index is not None:
+            att = state.device.codebook().to_db(index, state.device.thru_loss)
+            trace = TRACER.start(n, att)
+            trace.span('gui', trace.start)
+            ENGINE.submit_setpoint(n, index, CHECKBACK_DELAY / 1000,
+                                   lambda result: self.engine_bridge.signal_setpoint.emit(n, att, result, trace), trace)
+
+    def setpoint_resp(self, n, att, result, trace):
+        if not finish_setpoint(trace, n, att, result, journal):
+            return
+        if isinstance(result, Exception):
+            logging(f'[{n}К] Ошибка записи ослабления {att} дБ: {result!r}.')
+            return
+
+        verified = 'подтверждено' if result['verified'] else 'не подтверждено'
+        logging(f'[{n}К] Задано ослабление {att} дБ ({verified}, {result["latency"] * 1000:.0f} мс).')
+
+    def set_att(self, mode):
+        for n in self.selected_ids():
+            state = self.model.state(n)
+            if not state.connected:
+                continue
+            if mode == 'to_default':
+                self.model.set_attenuation(n, state.default)
+            elif mode == 'set_default':
+                index = state.setpoint()
+                att = state.device.codebook().to_db(index, state.device.thru_loss)
+                ENGINE.submit_default(n, index,
+                                      lambda result, n=n, att=att: self.engine_bridge.signal_default.emit(n, att, result))
+
+    def default_resp(self, n, att, result):
+        if isinstance(result, Exception):
+            logging(f'[{n}К] Ошибка записи ослабления по умолчанию {att} дБ: {result!r}.')
+            journal('default_error', n, att=att, error=repr(result))
+            return
+
+        logging(f'[{n}К] Задано ослабление по умолчанию {att} дБ.')
+        journal('default', n, att=att)
+
+    def backpressure_resp(self, n, depth):
+        logging(f'[{n}К] Очередь команд переполнена ({depth}), команда отклонена.')
+        journal('backpressure', n, depth=depth)
+
+    def att_plus_minus(self, step):
+        for n in self.selected_ids():
+            state = self.model.state(n)
+            if state.connected:
+                self.model.set_attenuation(n, state.setpoint() + step)
+
+    def change_selected_ip(self):
+        index = self.ui.tableView_channels.currentIndex()
+        if index.isValid():
+            self.change_ip(self.model.state_at(index.row()).n)
 
     def change_ip(self, n):
         global N_SET
         N_SET = n
-        self.app_change_ip.ui.label_set.setText(f'{n} комплект')
-        ip_pattern = r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}'
-        pushButtons_ip = [self.ui.pushButton_ip_1, self.ui.pushButton_ip_2]
-        ip = re.findall(ip_pattern, pushButtons_ip[n - 1].text())[0]
-        self.app_change_ip.ui.lineEdit_ip.setText(ip)
+        self.app_change_ip.ui.label_set.setText(DEVICES[n].name)
+        self.app_change_ip.ui.lineEdit_ip.setText(DEVICES[n].host)
         self.app_change_ip.show()
 
     def set_ip(self):
@@ -308,80 +444,148 @@ class IoLogikControl(QtWidgets.QMainWindow):
             ip_pattern = r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}'
             ip = re.fullmatch(ip_pattern, self.app_change_ip.ui.lineEdit_ip.text()).string
         except AttributeError:
-            msg = QtWidgets.QMessageBox()
-            msg.setIcon(QtWidgets.QMessageBox.Information)
-            msg.setWindowTitle('Информация')
-            msg.setText('Неверный формат IP-адреса')
-            msg.addButton('OK', QtWidgets.QMessageBox.AcceptRole)
-            msg.exec()
+            self.show_message('Неверный формат IP-адреса')
             return
 
-        IP[N_SET - 1] = ip
+        DEVICES[N_SET].host = ip
+        ENGINE.update_device(DEVICES[N_SET])
 
         logging(f'[{N_SET}К] Задан IP-адрес: {ip}.')
+        journal('ip_changed', N_SET, host=ip)
 
-        pushButtons_ip = [self.ui.pushButton_ip_1, self.ui.pushButton_ip_2]
-        pushButtons_ip[N_SET - 1].setText(f'         IP: {ip}    ')
-        lineEdits_settings = [self.app_settings.ui.lineEdit_ip_1, self.app_settings.ui.lineEdit_ip_2]
-        lineEdits_settings[N_SET - 1].setText(ip)
+        self.model.mark_dirty(N_SET)
 
         self.app_change_ip.close()
         self.save_settings()
 
+    def show_message(self, text):
+        msg = QtWidgets.QMessageBox()
+        msg.setIcon(QtWidgets.QMessageBox.Information)
+        msg.setWindowTitle('Информация')
+        msg.setText(text)
+        msg.addButton('OK', QtWidgets.QMessageBox.AcceptRole)
+        msg.exec()
+
+    def show_latency(self):
+        self.app_diagnostics.load_latency(ENGINE.latency())
+        self.app_diagnostics.ui.tabWidget.setCurrentWidget(self.app_diagnostics.ui.tab_latency)
+        self.app_diagnostics.show()
+
+    def export_latency(self):
+        date_time = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self.app_diagnostics, 'Экспорт задержек',
+                                                        os.path.join('ioLogik_logs', f'latency_{date_time}.json'),
+                                                        'JSON (*.json)')
+        if not path:
+            return
+        latency = {str(n): {operation: dict(histogram.summary(), buckets=histogram.buckets())
+                            for operation, histogram in operations.items()}
+                   for n, operations in ENGINE.latency().items()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(latency, f, ensure_ascii=False, indent=4)
+
+        logging(f'Задержки операций выгружены в {path}.')
+
+    def show_resources(self):
+        self.count_qt_objects()
+        self.app_diagnostics.load_resources(list(MONITOR.samples) + [MONITOR.sample()], MONITOR.growing)
+        self.app_diagnostics.ui.tabWidget.setCurrentWidget(self.app_diagnostics.ui.tab_resources)
+        self.app_diagnostics.show()
+
+    def memory_snapshot(self):
+        stats = MONITOR.snapshot_diff()
+        text = self.app_diagnostics.ui.plainTextEdit_snapshot
+        if stats is None:
+            text.setPlainText('Трассировка памяти включена. Повторное нажатие покажет прирост памяти по строкам кода.')
+            logging('Включена трассировка памяти.')
+            return
+        text.setPlainText('\n'.join(str(stat) for stat in stats))
+
+    def show_traces(self):
+        self.app_diagnostics.load_traces(list(TRACER.traces))
+        self.app_diagnostics.ui.tabWidget.setCurrentWidget(self.app_diagnostics.ui.tab_traces)
+        self.app_diagnostics.show()
+
+    def toggle_profiler(self, mode, checked):
+        actions = {SAMPLING: self.ui.action_profile_sampling, DETERMINISTIC: self.ui.action_profile_deterministic}
+        other = actions[DETERMINISTIC if mode == SAMPLING else SAMPLING]
+        if checked:
+            PROFILER.start(mode)
+            other.setEnabled(False)
+            logging(f'Профилирование запущено ({mode}).')
+            return
+        path, report = PROFILER.stop()
+        other.setEnabled(True)
+        logging(f'Профилирование завершено, результат: {path}.')
+        self.app_diagnostics.ui.plainTextEdit_profile.setPlainText(report)
+        self.app_diagnostics.ui.tabWidget.setCurrentWidget(self.app_diagnostics.ui.tab_profile)
+        self.app_diagnostics.show()
+
+    def show_settings(self):
+        self.app_settings.load_devices(DEVICES)
+        self.app_settings.ui.spinBox_metrics_port.setValue(METRICS_PORT)
+        self.app_settings.ui.lineEdit_metrics_host.setText(METRICS_HOST)
+        self.app_settings.show()
+
     def set_settings(self):
-        global IP, THRU_LOSS, LOGGING
+        global LOGGING, METRICS_PORT, METRICS_HOST
         try:
-            ip_pattern = r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}'
-            IP[0] = re.fullmatch(ip_pattern, self.app_settings.ui.lineEdit_ip_1.text()).string
-            IP[1] = re.fullmatch(ip_pattern, self.app_settings.ui.lineEdit_ip_2.text()).string
-
-            self.ui.pushButton_ip_1.setText(f'         IP: {IP[0]}    ')
-            self.ui.pushButton_ip_2.setText(f'         IP: {IP[1]}    ')
+            devices = self.app_settings.read_devices()
         except AttributeError:
-            msg = QtWidgets.QMessageBox()
-            msg.setIcon(QtWidgets.QMessageBox.Information)
-            msg.setWindowTitle('Информация')
-            msg.setText('Неверный формат IP-адреса')
-            msg.addButton('OK', QtWidgets.QMessageBox.AcceptRole)
-            msg.exec()
+            self.show_message('Неверный формат IP-адреса')
             return
-        try:
-            att_pattern = r'[\d|\.]{3,4}'
-            att_def_1 = float(re.findall(att_pattern, self.ui.pushButton_def_1.text())[0]) - THRU_LOSS[0]
-            att_def_2 = float(re.findall(att_pattern, self.ui.pushButton_def_2.text())[0]) - THRU_LOSS[1]
-            THRU_LOSS[0] = float(self.app_settings.ui.lineEdit_tl_1.text())
-            THRU_LOSS[1] = float(self.app_settings.ui.lineEdit_tl_2.text())
-            self.ui.pushButton_def_1.setText(f'По умолчанию: {att_def_1 + THRU_LOSS[0]} дБ')
-            self.ui.pushButton_def_2.setText(f'По умолчанию: {att_def_2 + THRU_LOSS[1]} дБ')
-
-            for i in range(self.ui.comboBox_1.count()):
-                self.ui.comboBox_1.setItemText(i, f'{str(i / 2 + THRU_LOSS[0])} дБ')
-                self.ui.comboBox_1.setItemData(i, i / 2 + THRU_LOSS[0])
-                self.ui.comboBox_2.setItemText(i, f'{str(i / 2 + THRU_LOSS[1])} дБ')
-                self.ui.comboBox_2.setItemData(i, i / 2 + THRU_LOSS[1])
-
-            LOGGING = self.app_settings.ui.checkBox_logs.isChecked()
-            if LOGGING:
-                check_logging_dir()
         except ValueError:
-            msg = QtWidgets.QMessageBox()
-            msg.setIcon(QtWidgets.QMessageBox.Information)
-            msg.setWindowTitle('Информация')
-            msg.setText('Неверный формат затухания')
-            msg.addButton('OK', QtWidgets.QMessageBox.AcceptRole)
-            msg.exec()
+            self.show_message('Неверный формат параметров модуля')
             return
 
+        for n in DEVICES.ids():
+            if n not in devices:
+                DEVICES.remove(n)
+                self.remove_device(n)
+                logging(f'[{n}К] Модуль удален.')
+                journal('device_removed', n)
+
+        for new in devices:
+            device = DEVICES.get(new.id)
+            if device is None:
+                DEVICES.add(new)
+                self.add_device(new)
+                logging(f'[{new.id}К] Добавлен модуль (IP: {new.host}).')
+                journal('device_added', new.id, host=new.host)
+                continue
+
+            device.host, device.port, device.unit = new.host, new.port, new.unit
+            device.thru_loss = new.thru_loss
+            self.model.mark_dirty(device.id)
+            ENGINE.update_device(device)
+
+        LOGGING = self.app_settings.ui.checkBox_logs.isChecked()
+        if LOGGING:
+            check_logging_dir()
+
+        host = self.app_settings.ui.lineEdit_metrics_host.text().strip() or '127.0.0.1'
+        if self.app_settings.ui.spinBox_metrics_port.value() != METRICS_PORT or host != METRICS_HOST:
+            METRICS_PORT = self.app_settings.ui.spinBox_metrics_port.value()
+            METRICS_HOST = host
+            start_metrics(METRICS_HOST, METRICS_PORT)
+
+        self.change_style()
         self.app_settings.close()
         self.save_settings()
 
     def save_settings(self):
-        SETTINGS.setValue('IP_1', IP[0])
-        SETTINGS.setValue('IP_2', IP[1])
+        # Список модулей службы хранится у неё самой, список из --devices — в своём файле
+        if ATTACH is None and DEVICES_FILE is None:
+            SETTINGS.setValue('devices', DEVICES.to_json())
         SETTINGS.setValue('logging', LOGGING)
-        SETTINGS.setValue('thru_loss_1', THRU_LOSS[0])
-        SETTINGS.setValue('thru_loss_2', THRU_LOSS[1])
         SETTINGS.setValue('style', STYLE)
+        SETTINGS.setValue('checkback_delay', CHECKBACK_DELAY)
+        SETTINGS.setValue('poll_min', POLL_MIN)
+        SETTINGS.setValue('poll_max', POLL_MAX)
+        SETTINGS.setValue('metrics_port', METRICS_PORT)
+        SETTINGS.setValue('metrics_host', METRICS_HOST)
+        SETTINGS.setValue('monitor_interval', MONITOR_INTERVAL)
+        SETTINGS.setValue('monitor_samples', MONITOR_SAMPLES)
 
 
 class ChangeIP(QtWidgets.QWidget):
@@ -404,6 +608,43 @@ class SettingsWidget(QtWidgets.QWidget):
         self.ui.setupUi(self)
         self.setWindowModality(Qt.ApplicationModal)
 
+    def load_devices(self, devices):
+        table = self.ui.tableWidget_devices
+        table.setRowCount(0)
+        for device in devices:
+            self.add_device_row(device=device)
+
+    def add_device_row(self, checked=False, device=None):
+        table = self.ui.tableWidget_devices
+        if device is None:
+            ids = [int(table.item(row, 0).text()) for row in range(table.rowCount())]
+            device = Device(max(ids, default=0) + 1, '192.168.10.84')
+        row = table.rowCount()
+        table.insertRow(row)
+        item_id = QtWidgets.QTableWidgetItem(str(device.id))
+        item_id.setFlags(item_id.flags() & ~Qt.ItemIsEditable)
+        table.setItem(row, 0, item_id)
+        for column, value in enumerate([device.host, device.port, device.unit, device.thru_loss], 1):
+            table.setItem(row, column, QtWidgets.QTableWidgetItem(str(value)))
+
+    def remove_device_rows(self):
+        table = self.ui.tableWidget_devices
+        for row in sorted({index.row() for index in table.selectedIndexes()}, reverse=True):
+            table.removeRow(row)
+
+    def read_devices(self):
+        table = self.ui.tableWidget_devices
+        ip_pattern = r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}'
+        devices = DeviceRegistry()
+        for row in range(table.rowCount()):
+            n = int(table.item(row, 0).text())
+            device = DEVICES.get(n)
+            name = device.name if device is not None else ''
+            devices.add(Device(n, re.fullmatch(ip_pattern, table.item(row, 1).text().strip()).string,
+                               int(table.item(row, 2).text()), int(table.item(row, 3).text()),
+                               float(table.item(row, 4).text()), name))
+        return devices
+
 
 class AboutWidget(QtWidgets.QWidget):
     def __init__(self):
@@ -423,58 +664,155 @@ class InstructionWidget(QtWidgets.QWidget):
         self.setWindowModality(Qt.ApplicationModal)
 
 
-class ConnectionThread(QThread):
-    signal_connect = pyqtSignal(int, int, list, int)
+class DiagnosticsWidget(QtWidgets.QWidget):
+    operations = {'connect': 'подключение', 'read_coils': 'чтение катушек',
+                  'read_discrete_inputs': 'чтение входов', 'write_multiple_coils': 'запись катушек'}
+    statuses = {'ok': 'подтверждено', 'unverified': 'не подтверждено обратной связью',
+                'unconfirmed': 'не подтверждено опросом', 'coalesced': 'заменено новой уставкой', 'error': 'ошибка'}
 
-    def __init__(self, n):
-        super().__init__()
-        self.n = n
-
-    def run(self):
-        while True:
-            ip = IP[self.n - 1]
-            try:
-                c = ModbusClient(host=ip, auto_open=True, auto_close=True, timeout=2)
-            except ValueError:
-                self.signal_connect.emit(self.n, 0, [], 1)
-                time.sleep(2)
-                continue
-            if not c.open():
-                time.sleep(2)
-                self.signal_connect.emit(self.n, 0, [], 1)
-                continue
-
-            try:
-                coils = c.read_coils(0, 12)
-                checkback_coils = c.read_discrete_inputs(0, 6)
-                coils_int = list(map(int, coils))
-                self.signal_connect.emit(self.n, 1, coils_int, coils[:6] == checkback_coils)
-
-            except TypeError:
-                self.signal_connect.emit(self.n, 0, [], 1)
-                time.sleep(2)
-                continue
-            time.sleep(2)
-
-
-class SetAttenuation(QThread):
-
-    def __init__(self, target, args):
+    def __init__(self):
         super().__init__()
-        self.set_att = target
-        self.args = args
+        self.setWindowFlags(Qt.WindowCloseButtonHint)
+        self.ui = diagnostics_gui.Ui_Form()
+        self.ui.setupUi(self)
+        self.traces = []
+        self.ui.tableWidget_traces.currentCellChanged.connect(self.select_trace)
 
-    def run(self):
-        self.set_att(*self.args)
+    def closeEvent(self, event):
+        # tracemalloc замедляет каждое выделение памяти, поэтому работает только пока открыто окно диагностики
+        if MONITOR.stop_tracing():
+            self.ui.plainTextEdit_snapshot.clear()
+            logging('Трассировка памяти выключена.')
+
+    def load_latency(self, latency):
+        table = self.ui.tableWidget_latency
+        table.setSortingEnabled(False)
+        rows = [(n, operation, histogram) for n, operations in sorted(latency.items())
+                for operation, histogram in operations.items() if histogram.count]
+        table.setRowCount(len(rows))
+        for row, (n, operation, histogram) in enumerate(rows):
+            summary = histogram.summary()
+            values = [n, self.operations[operation], summary['count']] + \
+                     [round(summary[key] * 1000, 2) for key in ('p50', 'p95', 'p99', 'max')]
+            for column, value in enumerate(values):
+                # Числа хранятся как данные, чтобы таблица сортировалась по значению
+                item = QtWidgets.QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+
+    def load_traces(self, traces):
+        # Последние команды сверху
+        self.traces = traces[::-1]
+        table = self.ui.tableWidget_traces
+        table.setRowCount(len(self.traces))
+        for row, trace in enumerate(self.traces):
+            values = [datetime.datetime.fromtimestamp(trace.wall).strftime('%H:%M:%S.%f')[:-3], trace.n,
+                      trace.label, round(trace.duration() * 1000, 1), self.statuses.get(trace.status, trace.status)]
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                table.setItem(row, column, item)
+        if self.traces:
+            table.setCurrentCell(0, 0)
+        else:
+            self.ui.widget_waterfall.set_trace(None)
+
+    def select_trace(self, row, *args):
+        if 0 <= row < len(self.traces):
+            self.ui.widget_waterfall.set_trace(self.traces[row])
+
+    def load_resources(self, samples, growing):
+        table = self.ui.tableWidget_resources
+        table.setRowCount(len(samples))
+        # Последние замеры сверху
+        for row, sample in enumerate(reversed(samples)):
+            values = [datetime.datetime.fromtimestamp(sample['time']).strftime('%d.%m.%Y %H:%M:%S'),
+                      round(sample['rss'] / 2 ** 20, 1), round(sample['uss'] / 2 ** 20, 1), sample['fds'],
+                      sample['sockets'], sample['threads'], sample['qt_objects'],
+                      ' / '.join(map(str, sample['gc_collections']))]
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                table.setItem(row, column, item)
+        growth = ', '.join(sorted(growing))
+        self.ui.label_growth.setText(f'Монотонный рост: {growth}' if growth else '')
+        self.ui.label_growth.setStyleSheet('color: red' if growth else '')
+
+
+class EngineBridge(QObject):
+    signal_state = pyqtSignal(int, object)
+    signal_setpoint = pyqtSignal(int, float, object, object)
+    signal_default = pyqtSignal(int, float, object)
+    signal_backpressure = pyqtSignal(int, int)
+    signal_breaker = pyqtSignal(int, str)
 
 
 def main():
-    app = QtWidgets.QApplication(sys.argv)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profile', choices=[SAMPLING, DETERMINISTIC],
+                        help='профилировать с момента запуска, результат записывается в ioLogik_logs при выходе')
+    parser.add_argument('--devices', help='список модулей из JSON-файла вместо сохранённого в настройках '
+                                          '(например, записанный simulator.py --devices)')
+    parser.add_argument('--attach', metavar='HOST[:PORT]',
+                        help='подключиться к службе daemon.py вместо опроса модулей из этой программы')
+    parser.add_argument('--control-socket', metavar='PATH',
+                        help='Unix-сокет строчного протокола для скриптов (control.py); при --attach задаётся у службы')
+    parser.add_argument('--scpi-port', type=int, metavar='PORT',
+                        help='TCP-порт команд SCPI (scpi.py, обычно 5025); при --attach задаётся у службы')
+    parser.add_argument('--http-port', type=int, metavar='PORT',
+                        help='порт HTTP/JSON API (http_api.py); при --attach задаётся у службы')
+    parser.add_argument('--scpi-host', default='127.0.0.1',
+                        help='адрес сервера SCPI; 0.0.0.0 — для приборов и стендов в сети')
+    parser.add_argument('--http-host', default='127.0.0.1',
+                        help='адрес HTTP API; API без проверки доступа, открывать в сеть только за межсетевым экраном')
+    args, qt_args = parser.parse_known_args()
+    global DEVICES, DEVICES_FILE, ENGINE, ATTACH, CONTROL, SCPI, HTTP_API
+    if args.devices:
+        DEVICES = DeviceRegistry.load(args.devices)
+        DEVICES_FILE = args.devices
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+    # Вторая копия завершается до того, как займёт сокеты и порты работающей
+    check_duplicates()
+    if args.attach:
+        host, _, port = args.attach.partition(':')
+        client = DaemonClient(host or '127.0.0.1', int(port or DEFAULT_PORT))
+        try:
+            client.connect()
+        except (OSError, asyncio.TimeoutError, DaemonError) as e:
+            QtWidgets.QMessageBox.critical(None, 'Ошибка', f'Нет связи со службой {args.attach}: {e!r}')
+            sys.exit(1)
+        ENGINE, DEVICES, ATTACH = client, client.devices, args.attach
     application = IoLogikControl()
+    if args.control_socket and ATTACH is None:
+        CONTROL = ControlServer(ENGINE, CHECKBACK_DELAY / 1000, journal)
+        try:
+            CONTROL.start(args.control_socket).result()
+        except OSError as e:
+            CONTROL = None
+            logging(f'Не удалось открыть сокет управления {args.control_socket}: {e!r}.')
+    if args.scpi_port and ATTACH is None:
+        SCPI = ScpiServer(ENGINE, CHECKBACK_DELAY / 1000, journal)
+        try:
+            SCPI.start(args.scpi_host, args.scpi_port).result()
+        except OSError as e:
+            SCPI = None
+            logging(f'Не удалось открыть порт SCPI {args.scpi_port}: {e!r}.')
+    if args.http_port and ATTACH is None:
+        HTTP_API = HttpApi(ENGINE, CHECKBACK_DELAY / 1000, journal)
+        try:
+            HTTP_API.start(args.http_host, args.http_port).result()
+        except OSError as e:
+            HTTP_API = None
+            logging(f'Не удалось открыть порт HTTP API {args.http_port}: {e!r}.')
+    if args.profile == SAMPLING:
+        application.ui.action_profile_sampling.setChecked(True)
+    elif args.profile == DETERMINISTIC:
+        application.ui.action_profile_deterministic.setChecked(True)
 
-    check_duplicates()
     if LOGGING:
         logging('Программа запущена.')
+        journal('start')
 
     application.show()
     sys.exit(app.exec())
@@ -15,7 +15,6 @@ class Ui_MainWindow(object):
         MainWindow.setObjectName("MainWindow")
         MainWindow.resize(665, 393)
         MainWindow.setMinimumSize(QtCore.QSize(665, 392))
-        MainWindow.setMaximumSize(QtCore.QSize(665, 393))
         font = QtGui.QFont()
         font.setPointSize(12)
         MainWindow.setFont(font)
@@ -27,222 +26,6 @@ class Ui_MainWindow(object):
         self.centralwidget.setObjectName("centralwidget")
         self.gridLayout = QtWidgets.QGridLayout(self.centralwidget)
         self.gridLayout.setObjectName("gridLayout")
-        self.gridLayout_2 = QtWidgets.QGridLayout()
-        self.gridLayout_2.setObjectName("gridLayout_2")
-        self.pushButton_set_def_1 = QtWidgets.QPushButton(self.centralwidget)
-        self.pushButton_set_def_1.setMinimumSize(QtCore.QSize(265, 40))
-        self.pushButton_set_def_1.setMaximumSize(QtCore.QSize(265, 40))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        font.setBold(False)
-        font.setItalic(False)
-        font.setUnderline(False)
-        font.setWeight(50)
-        font.setStrikeOut(False)
-        font.setKerning(True)
-        self.pushButton_set_def_1.setFont(font)
-        self.pushButton_set_def_1.setObjectName("pushButton_set_def_1")
-        self.gridLayout_2.addWidget(self.pushButton_set_def_1, 11, 0, 1, 2, QtCore.Qt.AlignHCenter)
-        spacerItem = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
-        self.gridLayout_2.addItem(spacerItem, 5, 0, 1, 4)
-        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
-        self.horizontalLayout_3.setSpacing(2)
-        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
-        spacerItem1 = QtWidgets.QSpacerItem(25, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
-        self.horizontalLayout_3.addItem(spacerItem1)
-        self.label_5 = QtWidgets.QLabel(self.centralwidget)
-        self.label_5.setMinimumSize(QtCore.QSize(120, 40))
-        self.label_5.setMaximumSize(QtCore.QSize(120, 40))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.label_5.setFont(font)
-        self.label_5.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
-        self.label_5.setObjectName("label_5")
-        self.horizontalLayout_3.addWidget(self.label_5, 0, QtCore.Qt.AlignHCenter)
-        self.comboBox_2 = QtWidgets.QComboBox(self.centralwidget)
-        self.comboBox_2.setMinimumSize(QtCore.QSize(110, 38))
-        self.comboBox_2.setMaximumSize(QtCore.QSize(110, 38))
-        font = QtGui.QFont()
-        font.setPointSize(16)
-        self.comboBox_2.setFont(font)
-        self.comboBox_2.setObjectName("comboBox_2")
-        self.horizontalLayout_3.addWidget(self.comboBox_2, 0, QtCore.Qt.AlignHCenter)
-        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
-        self.verticalLayout_2.setSpacing(0)
-        self.verticalLayout_2.setObjectName("verticalLayout_2")
-        self.pushButton_minus_2 = QtWidgets.QPushButton(self.centralwidget)
-        self.pushButton_minus_2.setMinimumSize(QtCore.QSize(20, 20))
-        self.pushButton_minus_2.setMaximumSize(QtCore.QSize(20, 20))
-        self.pushButton_minus_2.setStyleSheet("border: none")
-        self.pushButton_minus_2.setText("")
-        icon1 = QtGui.QIcon()
-        icon1.addPixmap(QtGui.QPixmap(":/icons/icons/minus_black.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        self.pushButton_minus_2.setIcon(icon1)
-        self.pushButton_minus_2.setIconSize(QtCore.QSize(18, 18))
-        self.pushButton_minus_2.setObjectName("pushButton_minus_2")
-        self.verticalLayout_2.addWidget(self.pushButton_minus_2)
-        self.pushButton_plus_2 = QtWidgets.QPushButton(self.centralwidget)
-        self.pushButton_plus_2.setMinimumSize(QtCore.QSize(20, 20))
-        self.pushButton_plus_2.setMaximumSize(QtCore.QSize(20, 20))
-        self.pushButton_plus_2.setStyleSheet("border: none")
-        self.pushButton_plus_2.setText("")
-        icon2 = QtGui.QIcon()
-        icon2.addPixmap(QtGui.QPixmap(":/icons/icons/plus_black.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        self.pushButton_plus_2.setIcon(icon2)
-        self.pushButton_plus_2.setIconSize(QtCore.QSize(18, 18))
-        self.pushButton_plus_2.setObjectName("pushButton_plus_2")
-        self.verticalLayout_2.addWidget(self.pushButton_plus_2)
-        self.horizontalLayout_3.addLayout(self.verticalLayout_2)
-        spacerItem2 = QtWidgets.QSpacerItem(32, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
-        self.horizontalLayout_3.addItem(spacerItem2)
-        self.gridLayout_2.addLayout(self.horizontalLayout_3, 8, 2, 3, 2)
-        self.pushButton_ip_2 = QtWidgets.QPushButton(self.centralwidget)
-        self.pushButton_ip_2.setMinimumSize(QtCore.QSize(265, 40))
-        self.pushButton_ip_2.setMaximumSize(QtCore.QSize(265, 40))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.pushButton_ip_2.setFont(font)
-        self.pushButton_ip_2.setLayoutDirection(QtCore.Qt.RightToLeft)
-        icon3 = QtGui.QIcon()
-        icon3.addPixmap(QtGui.QPixmap(":/icons/icons/led_red.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        self.pushButton_ip_2.setIcon(icon3)
-        self.pushButton_ip_2.setObjectName("pushButton_ip_2")
-        self.gridLayout_2.addWidget(self.pushButton_ip_2, 4, 2, 1, 2, QtCore.Qt.AlignHCenter)
-        self.horizontalLayout = QtWidgets.QHBoxLayout()
-        self.horizontalLayout.setSizeConstraint(QtWidgets.QLayout.SetDefaultConstraint)
-        self.horizontalLayout.setSpacing(2)
-        self.horizontalLayout.setObjectName("horizontalLayout")
-        spacerItem3 = QtWidgets.QSpacerItem(25, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
-        self.horizontalLayout.addItem(spacerItem3)
-        self.label_4 = QtWidgets.QLabel(self.centralwidget)
-        self.label_4.setMinimumSize(QtCore.QSize(120, 40))
-        self.label_4.setMaximumSize(QtCore.QSize(120, 40))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.label_4.setFont(font)
-        self.label_4.setStyleSheet("")
-        self.label_4.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
-        self.label_4.setObjectName("label_4")
-        self.horizontalLayout.addWidget(self.label_4, 0, QtCore.Qt.AlignHCenter)
-        self.comboBox_1 = QtWidgets.QComboBox(self.centralwidget)
-        self.comboBox_1.setMinimumSize(QtCore.QSize(110, 38))
-        self.comboBox_1.setMaximumSize(QtCore.QSize(110, 38))
-        font = QtGui.QFont()
-        font.setPointSize(16)
-        self.comboBox_1.setFont(font)
-        self.comboBox_1.setObjectName("comboBox_1")
-        self.horizontalLayout.addWidget(self.comboBox_1, 0, QtCore.Qt.AlignHCenter)
-        self.verticalLayout = QtWidgets.QVBoxLayout()
-        self.verticalLayout.setSizeConstraint(QtWidgets.QLayout.SetMinimumSize)
-        self.verticalLayout.setContentsMargins(0, -1, 0, 0)
-        self.verticalLayout.setSpacing(0)
-        self.verticalLayout.setObjectName("verticalLayout")
-        self.pushButton_minus_1 = QtWidgets.QPushButton(self.centralwidget)
-        self.pushButton_minus_1.setMinimumSize(QtCore.QSize(20, 20))
-        self.pushButton_minus_1.setMaximumSize(QtCore.QSize(20, 20))
-        font = QtGui.QFont()
-        font.setBold(False)
-        font.setWeight(50)
-        self.pushButton_minus_1.setFont(font)
-        self.pushButton_minus_1.setStyleSheet("border: none;")
-        self.pushButton_minus_1.setText("")
-        self.pushButton_minus_1.setIcon(icon1)
-        self.pushButton_minus_1.setIconSize(QtCore.QSize(18, 18))
-        self.pushButton_minus_1.setObjectName("pushButton_minus_1")
-        self.verticalLayout.addWidget(self.pushButton_minus_1)
-        self.pushButton_plus_1 = QtWidgets.QPushButton(self.centralwidget)
-        self.pushButton_plus_1.setMinimumSize(QtCore.QSize(20, 20))
-        self.pushButton_plus_1.setMaximumSize(QtCore.QSize(20, 20))
-        font = QtGui.QFont()
-        font.setBold(False)
-        font.setItalic(False)
-        font.setWeight(50)
-        self.pushButton_plus_1.setFont(font)
-        self.pushButton_plus_1.setStyleSheet("border: none;")
-        self.pushButton_plus_1.setText("")
-        self.pushButton_plus_1.setIcon(icon2)
-        self.pushButton_plus_1.setIconSize(QtCore.QSize(18, 18))
-        self.pushButton_plus_1.setObjectName("pushButton_plus_1")
-        self.verticalLayout.addWidget(self.pushButton_plus_1)
-        self.horizontalLayout.addLayout(self.verticalLayout)
-        spacerItem4 = QtWidgets.QSpacerItem(32, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
-        self.horizontalLayout.addItem(spacerItem4)
-        self.gridLayout_2.addLayout(self.horizontalLayout, 8, 0, 3, 2)
-        self.label_2 = QtWidgets.QLabel(self.centralwidget)
-        self.label_2.setMinimumSize(QtCore.QSize(200, 0))
-        self.label_2.setMaximumSize(QtCore.QSize(16777215, 30))
-        font = QtGui.QFont()
-        font.setPointSize(18)
-        self.label_2.setFont(font)
-        self.label_2.setAlignment(QtCore.Qt.AlignCenter)
-        self.label_2.setObjectName("label_2")
-        self.gridLayout_2.addWidget(self.label_2, 2, 0, 1, 2)
-        self.pushButton_set_def_2 = QtWidgets.QPushButton(self.centralwidget)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.pushButton_set_def_2.sizePolicy().hasHeightForWidth())
-        self.pushButton_set_def_2.setSizePolicy(sizePolicy)
-        self.pushButton_set_def_2.setMinimumSize(QtCore.QSize(265, 40))
-        self.pushButton_set_def_2.setMaximumSize(QtCore.QSize(265, 40))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.pushButton_set_def_2.setFont(font)
-        self.pushButton_set_def_2.setObjectName("pushButton_set_def_2")
-        self.gridLayout_2.addWidget(self.pushButton_set_def_2, 11, 2, 1, 2, QtCore.Qt.AlignHCenter)
-        self.pushButton_def_2 = QtWidgets.QPushButton(self.centralwidget)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.pushButton_def_2.sizePolicy().hasHeightForWidth())
-        self.pushButton_def_2.setSizePolicy(sizePolicy)
-        self.pushButton_def_2.setMinimumSize(QtCore.QSize(265, 40))
-        self.pushButton_def_2.setMaximumSize(QtCore.QSize(265, 40))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.pushButton_def_2.setFont(font)
-        self.pushButton_def_2.setObjectName("pushButton_def_2")
-        self.gridLayout_2.addWidget(self.pushButton_def_2, 6, 2, 1, 2, QtCore.Qt.AlignHCenter)
-        spacerItem5 = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.MinimumExpanding)
-        self.gridLayout_2.addItem(spacerItem5, 12, 0, 1, 4)
-        spacerItem6 = QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
-        self.gridLayout_2.addItem(spacerItem6, 7, 0, 1, 4)
-        self.label_3 = QtWidgets.QLabel(self.centralwidget)
-        self.label_3.setMinimumSize(QtCore.QSize(200, 0))
-        self.label_3.setMaximumSize(QtCore.QSize(16777215, 30))
-        font = QtGui.QFont()
-        font.setPointSize(18)
-        self.label_3.setFont(font)
-        self.label_3.setAlignment(QtCore.Qt.AlignCenter)
-        self.label_3.setObjectName("label_3")
-        self.gridLayout_2.addWidget(self.label_3, 2, 2, 1, 2)
-        spacerItem7 = QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.MinimumExpanding)
-        self.gridLayout_2.addItem(spacerItem7, 1, 0, 1, 4)
-        spacerItem8 = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
-        self.gridLayout_2.addItem(spacerItem8, 3, 0, 1, 4)
-        self.pushButton_def_1 = QtWidgets.QPushButton(self.centralwidget)
-        self.pushButton_def_1.setMinimumSize(QtCore.QSize(265, 40))
-        self.pushButton_def_1.setMaximumSize(QtCore.QSize(265, 40))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.pushButton_def_1.setFont(font)
-        self.pushButton_def_1.setObjectName("pushButton_def_1")
-        self.gridLayout_2.addWidget(self.pushButton_def_1, 6, 0, 1, 2, QtCore.Qt.AlignHCenter)
-        self.pushButton_ip_1 = QtWidgets.QPushButton(self.centralwidget)
-        self.pushButton_ip_1.setMinimumSize(QtCore.QSize(265, 40))
-        self.pushButton_ip_1.setMaximumSize(QtCore.QSize(265, 40))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.pushButton_ip_1.setFont(font)
-        self.pushButton_ip_1.setLayoutDirection(QtCore.Qt.RightToLeft)
-        self.pushButton_ip_1.setAutoFillBackground(False)
-        self.pushButton_ip_1.setIcon(icon3)
-        self.pushButton_ip_1.setIconSize(QtCore.QSize(16, 16))
-        self.pushButton_ip_1.setCheckable(False)
-        self.pushButton_ip_1.setAutoRepeat(False)
-        self.pushButton_ip_1.setAutoExclusive(False)
-        self.pushButton_ip_1.setObjectName("pushButton_ip_1")
-        self.gridLayout_2.addWidget(self.pushButton_ip_1, 4, 0, 1, 2, QtCore.Qt.AlignHCenter)
         self.label = QtWidgets.QLabel(self.centralwidget)
         self.label.setMinimumSize(QtCore.QSize(330, 0))
         self.label.setMaximumSize(QtCore.QSize(16777215, 30))
@@ -251,8 +34,60 @@ class Ui_MainWindow(object):
         self.label.setFont(font)
         self.label.setAlignment(QtCore.Qt.AlignCenter)
         self.label.setObjectName("label")
-        self.gridLayout_2.addWidget(self.label, 0, 0, 1, 4)
-        self.gridLayout.addLayout(self.gridLayout_2, 1, 0, 1, 5)
+        self.gridLayout.addWidget(self.label, 0, 0, 1, 1)
+        self.tableView_channels = QtWidgets.QTableView(self.centralwidget)
+        self.tableView_channels.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked|QtWidgets.QAbstractItemView.SelectedClicked|QtWidgets.QAbstractItemView.EditKeyPressed)
+        self.tableView_channels.setAlternatingRowColors(True)
+        self.tableView_channels.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableView_channels.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.tableView_channels.setObjectName("tableView_channels")
+        self.tableView_channels.horizontalHeader().setStretchLastSection(True)
+        self.tableView_channels.verticalHeader().setVisible(False)
+        self.gridLayout.addWidget(self.tableView_channels, 1, 0, 1, 1)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.pushButton_minus = QtWidgets.QPushButton(self.centralwidget)
+        self.pushButton_minus.setMinimumSize(QtCore.QSize(40, 40))
+        self.pushButton_minus.setMaximumSize(QtCore.QSize(40, 40))
+        self.pushButton_minus.setText("")
+        icon1 = QtGui.QIcon()
+        icon1.addPixmap(QtGui.QPixmap(":/icons/icons/minus.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.pushButton_minus.setIcon(icon1)
+        self.pushButton_minus.setIconSize(QtCore.QSize(18, 18))
+        self.pushButton_minus.setObjectName("pushButton_minus")
+        self.horizontalLayout.addWidget(self.pushButton_minus)
+        self.pushButton_plus = QtWidgets.QPushButton(self.centralwidget)
+        self.pushButton_plus.setMinimumSize(QtCore.QSize(40, 40))
+        self.pushButton_plus.setMaximumSize(QtCore.QSize(40, 40))
+        self.pushButton_plus.setText("")
+        icon2 = QtGui.QIcon()
+        icon2.addPixmap(QtGui.QPixmap(":/icons/icons/plus.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.pushButton_plus.setIcon(icon2)
+        self.pushButton_plus.setIconSize(QtCore.QSize(18, 18))
+        self.pushButton_plus.setObjectName("pushButton_plus")
+        self.horizontalLayout.addWidget(self.pushButton_plus)
+        self.pushButton_def = QtWidgets.QPushButton(self.centralwidget)
+        self.pushButton_def.setMinimumSize(QtCore.QSize(0, 40))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.pushButton_def.setFont(font)
+        self.pushButton_def.setObjectName("pushButton_def")
+        self.horizontalLayout.addWidget(self.pushButton_def)
+        self.pushButton_set_def = QtWidgets.QPushButton(self.centralwidget)
+        self.pushButton_set_def.setMinimumSize(QtCore.QSize(0, 40))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.pushButton_set_def.setFont(font)
+        self.pushButton_set_def.setObjectName("pushButton_set_def")
+        self.horizontalLayout.addWidget(self.pushButton_set_def)
+        self.pushButton_ip = QtWidgets.QPushButton(self.centralwidget)
+        self.pushButton_ip.setMinimumSize(QtCore.QSize(0, 40))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.pushButton_ip.setFont(font)
+        self.pushButton_ip.setObjectName("pushButton_ip")
+        self.horizontalLayout.addWidget(self.pushButton_ip)
+        self.gridLayout.addLayout(self.horizontalLayout, 2, 0, 1, 1)
         MainWindow.setCentralWidget(self.centralwidget)
         self.menuBar = QtWidgets.QMenuBar(MainWindow)
         self.menuBar.setGeometry(QtCore.QRect(0, 0, 665, 21))
@@ -261,25 +96,39 @@ class Ui_MainWindow(object):
         self.menu.setObjectName("menu")
         self.menu_2 = QtWidgets.QMenu(self.menuBar)
         self.menu_2.setObjectName("menu_2")
+        self.menu_3 = QtWidgets.QMenu(self.menuBar)
+        self.menu_3.setObjectName("menu_3")
         MainWindow.setMenuBar(self.menuBar)
         self.action_settings = QtWidgets.QAction(MainWindow)
-        icon4 = QtGui.QIcon()
-        icon4.addPixmap(QtGui.QPixmap(":/icons/icons/gear.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        self.action_settings.setIcon(icon4)
+        icon3 = QtGui.QIcon()
+        icon3.addPixmap(QtGui.QPixmap(":/icons/icons/gear.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.action_settings.setIcon(icon3)
         self.action_settings.setMenuRole(QtWidgets.QAction.TextHeuristicRole)
         self.action_settings.setObjectName("action_settings")
         self.action_exit = QtWidgets.QAction(MainWindow)
-        icon5 = QtGui.QIcon()
-        icon5.addPixmap(QtGui.QPixmap(":/icons/icons/exit.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        self.action_exit.setIcon(icon5)
+        icon4 = QtGui.QIcon()
+        icon4.addPixmap(QtGui.QPixmap(":/icons/icons/exit.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.action_exit.setIcon(icon4)
         self.action_exit.setMenuRole(QtWidgets.QAction.TextHeuristicRole)
         self.action_exit.setIconVisibleInMenu(True)
         self.action_exit.setObjectName("action_exit")
         self.action_about = QtWidgets.QAction(MainWindow)
-        icon6 = QtGui.QIcon()
-        icon6.addPixmap(QtGui.QPixmap(":/icons/icons/help.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        self.action_about.setIcon(icon6)
+        icon5 = QtGui.QIcon()
+        icon5.addPixmap(QtGui.QPixmap(":/icons/icons/help.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.action_about.setIcon(icon5)
         self.action_about.setObjectName("action_about")
+        self.action_latency = QtWidgets.QAction(MainWindow)
+        self.action_latency.setObjectName("action_latency")
+        self.action_resources = QtWidgets.QAction(MainWindow)
+        self.action_resources.setObjectName("action_resources")
+        self.action_traces = QtWidgets.QAction(MainWindow)
+        self.action_traces.setObjectName("action_traces")
+        self.action_profile_sampling = QtWidgets.QAction(MainWindow)
+        self.action_profile_sampling.setCheckable(True)
+        self.action_profile_sampling.setObjectName("action_profile_sampling")
+        self.action_profile_deterministic = QtWidgets.QAction(MainWindow)
+        self.action_profile_deterministic.setCheckable(True)
+        self.action_profile_deterministic.setObjectName("action_profile_deterministic")
         self.action_instruction = QtWidgets.QAction(MainWindow)
         self.action_instruction.setObjectName("action_instruction")
         self.menu.addAction(self.action_settings)
@@ -287,43 +136,39 @@ class Ui_MainWindow(object):
         self.menu.addAction(self.action_exit)
         self.menu_2.addAction(self.action_about)
         self.menu_2.addAction(self.action_instruction)
+        self.menu_3.addAction(self.action_latency)
+        self.menu_3.addAction(self.action_resources)
+        self.menu_3.addAction(self.action_traces)
+        self.menu_3.addSeparator()
+        self.menu_3.addAction(self.action_profile_sampling)
+        self.menu_3.addAction(self.action_profile_deterministic)
         self.menuBar.addAction(self.menu.menuAction())
+        self.menuBar.addAction(self.menu_3.menuAction())
         self.menuBar.addAction(self.menu_2.menuAction())
 
         self.retranslateUi(MainWindow)
         QtCore.QMetaObject.connectSlotsByName(MainWindow)
-        MainWindow.setTabOrder(self.pushButton_ip_1, self.pushButton_def_1)
-        MainWindow.setTabOrder(self.pushButton_def_1, self.comboBox_1)
-        MainWindow.setTabOrder(self.comboBox_1, self.pushButton_minus_1)
-        MainWindow.setTabOrder(self.pushButton_minus_1, self.pushButton_plus_1)
-        MainWindow.setTabOrder(self.pushButton_plus_1, self.pushButton_set_def_1)
-        MainWindow.setTabOrder(self.pushButton_set_def_1, self.pushButton_ip_2)
-        MainWindow.setTabOrder(self.pushButton_ip_2, self.pushButton_def_2)
-        MainWindow.setTabOrder(self.pushButton_def_2, self.comboBox_2)
-        MainWindow.setTabOrder(self.comboBox_2, self.pushButton_minus_2)
-        MainWindow.setTabOrder(self.pushButton_minus_2, self.pushButton_plus_2)
-        MainWindow.setTabOrder(self.pushButton_plus_2, self.pushButton_set_def_2)
 
     def retranslateUi(self, MainWindow):
         _translate = QtCore.QCoreApplication.translate
         MainWindow.setWindowTitle(_translate("MainWindow", "Управление аттенюаторами"))
-        self.pushButton_set_def_1.setText(_translate("MainWindow", "Установить как значение\n"
+        self.label.setText(_translate("MainWindow", "Управление аттенюаторами"))
+        self.pushButton_def.setText(_translate("MainWindow", "Установить значение\n"
 "по умолчанию"))
-        self.label_5.setText(_translate("MainWindow", "Ослабление:"))
-        self.pushButton_ip_2.setText(_translate("MainWindow", "         IP: 192.168.10.85     "))
-        self.label_4.setText(_translate("MainWindow", "Ослабление:"))
-        self.label_2.setText(_translate("MainWindow", "1 комплект"))
-        self.pushButton_set_def_2.setText(_translate("MainWindow", "Установить как значение\n"
+        self.pushButton_set_def.setText(_translate("MainWindow", "Установить как значение\n"
 "по умолчанию"))
-        self.pushButton_def_2.setText(_translate("MainWindow", "По умолчанию: 4.5 дБ"))
-        self.label_3.setText(_translate("MainWindow", "2 комплект"))
-        self.pushButton_def_1.setText(_translate("MainWindow", "По умолчанию: 4.5 дБ"))
-        self.pushButton_ip_1.setText(_translate("MainWindow", "         IP: 192.168.10.84     "))
-        self.label.setText(_translate("MainWindow", "Управление аттенюаторами"))
+        self.pushButton_ip.setText(_translate("MainWindow", "Изменить\n"
+"IP-адрес"))
         self.menu.setTitle(_translate("MainWindow", "Файл"))
         self.menu_2.setTitle(_translate("MainWindow", "Справка"))
+        self.menu_3.setTitle(_translate("MainWindow", "Диагностика"))
         self.action_settings.setText(_translate("MainWindow", "Настройки"))
         self.action_exit.setText(_translate("MainWindow", "Выход"))
         self.action_about.setText(_translate("MainWindow", "О программе"))
+        self.action_latency.setText(_translate("MainWindow", "Задержки операций"))
+        self.action_resources.setText(_translate("MainWindow", "Ресурсы"))
+        self.action_traces.setText(_translate("MainWindow", "Трассировка команд"))
+        self.action_profile_sampling.setText(_translate("MainWindow", "Профилирование (выборочное)"))
+        self.action_profile_deterministic.setText(_translate("MainWindow", "Профилирование (полное)"))
         self.action_instruction.setText(_translate("MainWindow", "Инструкция"))
 import resources_rc
@@ -0,0 +1,102 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+
+
+LATENCY_BOUNDS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+
+COUNTERS = [('polls', 'iologik_polls_total', 'Успешные опросы модуля'),
+            ('poll_failures', 'iologik_poll_failures_total', 'Неудачные опросы модуля'),
+            ('opens', 'iologik_connections_total', 'Открытые соединения'),
+            ('reconnects', 'iologik_reconnects_total', 'Повторные подключения'),
+            ('failures', 'iologik_connection_failures_total', 'Ошибки соединения'),
+            ('checkback_mismatches', 'iologik_checkback_mismatches_total', 'Несовпадения обратной связи'),
+            ('setpoints_sent', 'iologik_setpoints_total', 'Записанные уставки'),
+            ('setpoints_coalesced', 'iologik_setpoints_coalesced_total', 'Объединённые уставки'),
+            ('commands_sent', 'iologik_commands_total', 'Отправленные команды'),
+            ('commands_rejected', 'iologik_commands_rejected_total', 'Команды, отклонённые из-за переполнения очереди'),
+            ('commands_failed_fast', 'iologik_commands_failed_fast_total', 'Команды, сброшенные при разомкнутой цепи'),
+            ('breaker_opened', 'iologik_breaker_opened_total', 'Размыкания цепи защиты')]
+
+GAUGES = [('queue_depth', 'iologik_queue_depth', 'Команд в очереди'),
+          ('poll_interval', 'iologik_poll_interval_seconds', 'Текущий период опроса'),
+          ('connected', 'iologik_connected', 'Есть соединение с модулем')]
+
+
+def _labels(item):
+    return f'device="{item["n"]}",host="{item["host"]}"'
+
+
+def render(stats, process):
+    lines = []
+    for key, name, text in COUNTERS:
+        lines += [f'# HELP {name} {text}', f'# TYPE {name} counter']
+        lines += [f'{name}{{{_labels(item)}}} {item[key]}' for item in stats]
+    for key, name, text in GAUGES:
+        lines += [f'# HELP {name} {text}', f'# TYPE {name} gauge']
+        lines += [f'{name}{{{_labels(item)}}} {float(item[key])}' for item in stats]
+    name = 'iologik_breaker_open'
+    lines += [f'# HELP {name} Цепь защиты разомкнута', f'# TYPE {name} gauge']
+    lines += [f'{name}{{{_labels(item)}}} {int(item["breaker_state"] != "closed")}' for item in stats]
+
+    name = 'iologik_operation_latency_seconds'
+    lines += [f'# HELP {name} Длительность операций Modbus', f'# TYPE {name} histogram']
+    for item in stats:
+        for operation, (cumulative, count, total) in item['latency'].items():
+            labels = f'{_labels(item)},operation="{operation}"'
+            lines += [f'{name}_bucket{{{labels},le="{bound}"}} {value}'
+                      for bound, value in zip(LATENCY_BOUNDS, cumulative)]
+            lines += [f'{name}_bucket{{{labels},le="+Inf"}} {count}',
+                      f'{name}_sum{{{labels}}} {total}', f'{name}_count{{{labels}}} {count}']
+
+    for name, (kind, text, value) in process.items():
+        lines += [f'# HELP {name} {text}', f'# TYPE {name} {kind}', f'{name} {value}']
+    return '\n'.join(lines) + '\n'
+
+
+def collect(engine, log=None, extra=None):
+    # Метрики движка и процесса; счётчики журнала добавляются, если запись журнала ведётся
+    process = psutil.Process()
+    values = {'process_resident_memory_bytes': ('gauge', 'Резидентная память процесса', process.memory_info().rss),
+              'process_threads': ('gauge', 'Потоки процесса', process.num_threads())}
+    if log is not None:
+        log_stats = log.stats()
+        values['iologik_log_written_total'] = ('counter', 'Записи журнала', log_stats['written'])
+        values['iologik_log_dropped_total'] = ('counter', 'Отброшенные записи журнала', log_stats['dropped'])
+    values.update(extra or {})
+    return render(engine.metrics(LATENCY_BOUNDS), values)
+
+
+class MetricsServer:
+    def __init__(self, port, collect, host='127.0.0.1'):
+        self.collect = collect
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = server.collect().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='MetricsServer', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,144 @@
+import asyncio
+import struct
+import time
+
+from histogram import LatencyHistogram
+
+
+READ_COILS = 0x01
+READ_DISCRETE_INPUTS = 0x02
+WRITE_MULTIPLE_COILS = 0x0F
+
+FUNCTIONS = {READ_COILS: 'read_coils', READ_DISCRETE_INPUTS: 'read_discrete_inputs',
+             WRITE_MULTIPLE_COILS: 'write_multiple_coils'}
+OPERATIONS = ['connect'] + list(FUNCTIONS.values())
+
+
+class ModbusError(Exception):
+    pass
+
+
+def pack_bits(values):
+    data = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value:
+            data[i // 8] |= 1 << (i % 8)
+    return bytes(data)
+
+
+def unpack_bits(data, count):
+    return [bool(data[i // 8] >> (i % 8) & 1) for i in range(count)]
+
+
+class AsyncModbusClient:
+    def __init__(self, host, port=502, unit_id=1, timeout=2):
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+        self._tid = 0
+        self._pending = {}
+        self._reader_task = None
+        self.opens = 0
+        self.reconnects = 0
+        self.reuses = 0
+        self.failures = 0
+        self.latency = {operation: LatencyHistogram() for operation in OPERATIONS}
+
+    @property
+    def is_open(self):
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def open(self):
+        async with self._lock:
+            if self.is_open:
+                self.reuses += 1
+                return
+            start = time.perf_counter()
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout)
+            except (OSError, asyncio.TimeoutError):
+                self.failures += 1
+                raise
+            self.latency['connect'].record(time.perf_counter() - start)
+            self._reader_task = asyncio.get_running_loop().create_task(self._read_responses(self._reader))
+            if self.opens:
+                self.reconnects += 1
+            self.opens += 1
+
+    def close(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionResetError(f'connection to {self.host}:{self.port} closed'))
+
+    async def _read_responses(self, reader):
+        # Ответы сопоставляются с запросами по идентификатору транзакции, поэтому
+        # несколько запросов могут находиться в сокете одновременно
+        try:
+            while True:
+                tid, _, length, _ = struct.unpack('>HHHB', await reader.readexactly(7))
+                response = await reader.readexactly(length - 1)
+                future = self._pending.pop(tid, None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (OSError, asyncio.IncompleteReadError):
+            if self._reader is reader:
+                self.failures += 1
+                self._reader_task = None
+                self.close()
+
+    def _next_tid(self):
+        self._tid = (self._tid + 1) & 0xFFFF
+        while self._tid in self._pending:
+            self._tid = (self._tid + 1) & 0xFFFF
+        return self._tid
+
+    async def _request(self, pdu):
+        await self.open()
+        tid = self._next_tid()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tid] = future
+        start = time.perf_counter()
+        self._writer.write(struct.pack('>HHHB', tid, 0, len(pdu) + 1, self.unit_id) + pdu)
+        try:
+            response = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(tid, None)
+            self.failures += 1
+            self.close()
+            raise
+        self.latency[FUNCTIONS[pdu[0]]].record(time.perf_counter() - start)
+        if response[0] & 0x80:
+            raise ModbusError(f'exception code {response[1]} for function {pdu[0]}')
+        return response
+
+    async def _read_bits(self, function, address, count):
+        response = await self._request(struct.pack('>BHH', function, address, count))
+        return unpack_bits(response[2:], count)
+
+    async def read_coils(self, address, count):
+        return await self._read_bits(READ_COILS, address, count)
+
+    async def read_discrete_inputs(self, address, count):
+        return await self._read_bits(READ_DISCRETE_INPUTS, address, count)
+
+    async def write_multiple_coils(self, address, values):
+        data = pack_bits(values)
+        await self._request(struct.pack('>BHHB', WRITE_MULTIPLE_COILS, address, len(values), len(data)) + data)
+        return True
+
+    def stats(self):
+        return {'host': self.host, 'opens': self.opens, 'reconnects': self.reconnects,
+                'reuses': self.reuses, 'failures': self.failures, 'open': self.is_open}
@@ -0,0 +1,92 @@
+import collections
+import gc
+import threading
+import time
+import tracemalloc
+
+import psutil
+
+
+GROWTH_KEYS = ['rss', 'uss', 'fds', 'sockets', 'threads', 'qt_objects']
+
+
+class ResourceMonitor:
+    def __init__(self, interval=60, size=1440, growth_samples=10):
+        self.interval = interval
+        self.samples = collections.deque(maxlen=size)
+        self.growth_samples = growth_samples
+        self.growing = set()
+        # Количество объектов Qt обновляется из потока интерфейса: обращаться к Qt из монитора нельзя
+        self.qt_objects = 0
+        self.on_sample = None
+        self.on_growth = None
+        self.process = psutil.Process()
+        self.baseline = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='ResourceMonitor', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            sample = self.sample()
+            self.samples.append(sample)
+            self._check_growth()
+            if self.on_sample is not None:
+                self.on_sample(sample)
+
+    def sample(self):
+        process = self.process
+        with process.oneshot():
+            memory = process.memory_info()
+            try:
+                uss = process.memory_full_info().uss
+            except (psutil.AccessDenied, AttributeError):
+                uss = 0
+            fds = process.num_fds() if hasattr(process, 'num_fds') else process.num_handles()
+            try:
+                sockets = len(process.net_connections())
+            except AttributeError:
+                sockets = len(process.connections())
+            threads = process.num_threads()
+        return {'time': time.time(), 'rss': memory.rss, 'uss': uss, 'fds': fds, 'sockets': sockets,
+                'threads': threads, 'gc': gc.get_count(), 'gc_collections': [s['collections'] for s in gc.get_stats()],
+                'qt_objects': self.qt_objects}
+
+    def _check_growth(self):
+        # Рост отмечается, если величина не убывала ни разу за последние growth_samples замеров и выросла
+        if len(self.samples) < self.growth_samples:
+            return
+        recent = list(self.samples)[-self.growth_samples:]
+        for key in GROWTH_KEYS:
+            values = [sample[key] for sample in recent]
+            growing = values[-1] > values[0] and all(a <= b for a, b in zip(values, values[1:]))
+            if growing and key not in self.growing:
+                self.growing.add(key)
+                if self.on_growth is not None:
+                    self.on_growth(key, values[0], values[-1])
+            elif not growing:
+                self.growing.discard(key)
+
+    def snapshot_diff(self, limit=20):
+        # Первый вызов запускает tracemalloc и запоминает базовый снимок, следующие сравнивают с ним
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self.baseline = tracemalloc.take_snapshot()
+            return None
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(self.baseline, 'lineno')
+        self.baseline = snapshot
+        return stats[:limit]
+
+    def stop_tracing(self):
+        # Возвращает True, если трассировка была включена
+        self.baseline = None
+        if not tracemalloc.is_tracing():
+            return False
+        tracemalloc.stop()
+        return True
@@ -0,0 +1,143 @@
+import collections
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+
+
+SAMPLING = 'sampling'
+DETERMINISTIC = 'deterministic'
+
+# Вершины стека, означающие простой потока; в отчёт о горячих путях не попадают
+IDLE = ('wait (threading.py', 'select (selectors.py', 'accept (socket.py')
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005, idle=()):
+        self.interval = interval
+        self.idle = IDLE + tuple(idle)
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write(self, path):
+        # Формат collapsed stacks: подходит для flamegraph.pl и speedscope
+        with open(f'{path}.collapsed', 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        return f'{path}.collapsed'
+
+    def report(self, limit=20):
+        busy = collections.Counter()
+        leaves = collections.Counter()
+        for stack, count in self.stacks.items():
+            thread, _, rest = stack.partition(';')
+            leaf = rest.rsplit(';', 1)[-1]
+            if leaf.startswith(self.idle):
+                continue
+            busy[stack] += count
+            leaves[f'{thread}: {leaf}'] += count
+        total = sum(self.stacks.values()) or 1
+        lines = [f'Замеров: {self.samples}, период {self.interval * 1000:.0f} мс, '
+                 f'потоки заняты {sum(busy.values()) / total * 100:.1f} % времени', '', 'Функции на вершине стека:']
+        lines += [f'{count / total * 100:6.1f} %  {leaf}' for leaf, count in leaves.most_common(limit)]
+        lines += ['', 'Стеки:']
+        lines += [f'{count / total * 100:6.1f} %  {stack}' for stack, count in busy.most_common(limit)]
+        return '\n'.join(lines)
+
+
+class DeterministicProfiler:
+    def __init__(self, runners):
+        # runners: имя потока -> функция, выполняющая вызов в этом потоке
+        self.names = list(runners)
+        if sys.version_info >= (3, 12):
+            # cProfile на sys.monitoring охватывает все потоки, а второй включённый профилировщик вызывает ошибку
+            self.runners = {'all': lambda func: func()}
+        else:
+            self.runners = runners
+        self.profiles = {name: cProfile.Profile() for name in self.runners}
+
+    def start(self):
+        for name, run in self.runners.items():
+            run(self.profiles[name].enable)
+
+    def stop(self):
+        for name, run in self.runners.items():
+            run(self.profiles[name].disable)
+
+    def stats(self, stream=None):
+        stats = None
+        for profile in self.profiles.values():
+            if stats is None:
+                stats = pstats.Stats(profile, stream=stream)
+            else:
+                stats.add(profile)
+        return stats
+
+    def write(self, path):
+        self.stats().dump_stats(f'{path}.pstats')
+        return f'{path}.pstats'
+
+    def report(self, limit=20):
+        stream = io.StringIO()
+        stats = self.stats(stream)
+        stats.sort_stats('cumulative').print_stats(limit)
+        stats.sort_stats('tottime').print_stats(limit)
+        return f'Потоки: {", ".join(self.names)}\n{stream.getvalue()}'
+
+
+class Profiler:
+    def __init__(self, directory, runners, idle=()):
+        self.directory = directory
+        self.runners = runners
+        self.idle = idle
+        self.mode = None
+        self.active = None
+        self.started = None
+
+    def start(self, mode):
+        if self.active is not None:
+            return
+        self.active = SamplingProfiler(idle=self.idle) if mode == SAMPLING else DeterministicProfiler(self.runners)
+        self.mode = mode
+        self.started = time.monotonic()
+        self.active.start()
+
+    def stop(self):
+        if self.active is None:
+            return None, ''
+        active, self.active = self.active, None
+        active.stop()
+        os.makedirs(self.directory, exist_ok=True)
+        name = f'profile_{datetime.datetime.now().strftime("%Y%m%d_%H%M%S")}_{self.mode}'
+        path = active.write(os.path.join(self.directory, name))
+        duration = time.monotonic() - self.started
+        return path, f'Профилирование {duration:.1f} с, результат: {path}\n\n{active.report()}'
@@ -0,0 +1,23 @@
+class PollSchedule:
+    def __init__(self, min_interval, max_interval, backoff=1.5):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self.interval = self.min_interval
+        self.last_values = None
+
+    def changed(self):
+        self.interval = self.min_interval
+
+    def stable(self):
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def update(self, values, checkback):
+        # Быстрый опрос после изменения состояния или при несовпадении обратной связи,
+        # иначе период постепенно увеличивается до максимального
+        if values != self.last_values or not checkback:
+            self.changed()
+        else:
+            self.stable()
+        self.last_values = values
+        return self.interval
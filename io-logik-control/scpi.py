@@ -0,0 +1,196 @@
+import asyncio
+import collections
+import re
+
+from control import ControlError, LineServer, db_text
+from engine import SetpointSuperseded
+
+
+IDN = 'Maslov,ioLogikControl,0,1.0'
+
+# Ошибки SCPI: код и текст для SYSTem:ERRor?
+UNDEFINED_HEADER = (-113, 'Undefined header')
+HEADER_SUFFIX = (-114, 'Header suffix out of range')
+MISSING_PARAMETER = (-109, 'Missing parameter')
+DATA_TYPE = (-104, 'Data type error')
+DATA_OUT_OF_RANGE = (-222, 'Data out of range')
+EXECUTION_ERROR = (-200, 'Execution error')
+QUEUE_OVERFLOW = (-350, 'Queue overflow')
+ERROR_QUEUE_SIZE = 20
+
+# ATTenuator<n>:LEVel, ATTenuator:ALL:LEVel, ATTenuator:COUNt? — допускаются краткая и полная формы
+HEADER = re.compile(r':?(?:ATT|ATTENUATOR)(\d*)(:ALL)?:([A-Z]+)(\?)?$', re.IGNORECASE)
+NODES = {'LEV': 'level', 'LEVEL': 'level', 'DEF': 'default', 'DEFAULT': 'default',
+         'CHEC': 'checkback', 'CHECKBACK': 'checkback', 'CONN': 'connected', 'CONNECTED': 'connected',
+         'COUN': 'count', 'COUNT': 'count', 'CAT': 'catalog', 'CATALOG': 'catalog'}
+SYSTEM_ERROR = re.compile(r':?SYST(?:EM)?:ERR(?:OR)?(?::NEXT)?\?$', re.IGNORECASE)
+
+
+class ScpiError(Exception):
+    def __init__(self, error, detail=''):
+        super().__init__(error, detail)
+        self.error = error
+        self.detail = detail
+
+
+class Session:
+    def __init__(self):
+        # Незавершённые записи сеанса, которых ждёт *OPC?
+        self.pending = set()
+        self.errors = collections.deque()
+        # Отложенный ответ предыдущей строки: следующая строка выполняется после него, чтобы очередь ошибок,
+        # *CLS и запросы видели команды в порядке поступления
+        self.last = None
+
+    def error(self, error, detail=''):
+        code, text = error
+        if len(self.errors) >= ERROR_QUEUE_SIZE:
+            self.errors[-1] = QUEUE_OVERFLOW[0], QUEUE_OVERFLOW[1]
+            return
+        self.errors.append((code, f'{text};{detail}' if detail else text))
+
+
+class ScpiServer(LineServer):
+    # Несколько команд в одной строке разделяются «;», ответы на запросы строки возвращаются одной строкой
+    # через «;». Записи ослабления выполняются одновременно и не задерживают следующие команды; *OPC? отвечает 1,
+    # когда завершены все записи сеанса
+    source = 'scpi'
+
+    async def _start(self, host, port):
+        self.server = await asyncio.start_server(self._serve, host, port)
+
+    def session(self):
+        return Session()
+
+    def execute(self, session, line):
+        if session.last is not None and not session.last.done():
+            response = asyncio.get_running_loop().create_task(self._execute_after(session.last, session, line))
+        else:
+            response = self._execute(session, line)
+        if isinstance(response, asyncio.Future):
+            session.last = response
+        return response
+
+    async def _execute_after(self, previous, session, line):
+        await previous
+        response = self._execute(session, line)
+        if isinstance(response, asyncio.Future):
+            response = await response
+        return response
+
+    def _execute(self, session, line):
+        responses = []
+        for command in line.split(';'):
+            command = command.strip()
+            if not command:
+                continue
+            try:
+                response = self._command(session, command)
+            except ScpiError as e:
+                session.error(e.error, e.detail)
+                continue
+            if response is not None:
+                responses.append(response)
+        if not responses:
+            return None
+        # Запросы выполняются в порядке команд: после записей и *OPC? — когда движок примет уставки этой строки
+        if not session.pending and not any(isinstance(response, asyncio.Future) for response in responses):
+            return ';'.join(response() for response in responses)
+        return asyncio.get_running_loop().create_task(self._join(responses))
+
+    async def _join(self, responses):
+        results = []
+        for response in responses:
+            results.append(await response if isinstance(response, asyncio.Future) else response())
+        return ';'.join(results)
+
+    def _command(self, session, command):
+        header, _, argument = command.partition(' ')
+        argument = argument.strip()
+        upper = header.upper()
+        if upper == '*IDN?':
+            return lambda: IDN
+        if upper == '*OPC?':
+            return self._operation_complete(session)
+        if upper in ('*OPC', '*WAI'):
+            return None
+        if upper == '*CLS':
+            session.errors.clear()
+            return None
+        if SYSTEM_ERROR.match(header):
+            return lambda: self._next_error(session)
+
+        match = HEADER.match(header)
+        if match is None or match.group(3).upper() not in NODES:
+            raise ScpiError(UNDEFINED_HEADER, header)
+        suffix, every, node, query = match.groups()
+        node = NODES[node.upper()]
+        if node == 'count' and query and not suffix:
+            return lambda: str(len(self.engine.devices))
+        if node == 'catalog' and query and not suffix:
+            return lambda: ','.join(map(str, self.engine.devices))
+        if node in ('count', 'catalog') or every and suffix or every and node not in ('level', 'default'):
+            raise ScpiError(UNDEFINED_HEADER, header)
+
+        links = list(self.engine.devices.values()) if every else [self._scpi_link(suffix or '1')]
+        if query:
+            return lambda: ','.join(self._query(link, node) for link in links)
+        if node not in ('level', 'default'):
+            raise ScpiError(UNDEFINED_HEADER, header)
+        if not argument:
+            raise ScpiError(MISSING_PARAMETER, header)
+        try:
+            db = float(argument)
+        except ValueError:
+            raise ScpiError(DATA_TYPE, argument)
+        # Значение проверяется для всех модулей до отправки, чтобы ATT:ALL не выполнялся частично
+        indexes = []
+        for link in links:
+            try:
+                indexes.append(self._index(link, db))
+            except ValueError:
+                raise ScpiError(DATA_OUT_OF_RANGE, f'{argument} dB for ATT{link.n}')
+        for link, index in zip(links, indexes):
+            if node == 'level':
+                future = self._setpoint(link, index, lambda result, n=link.n: self._done(session, n, result))
+            else:
+                future = self._default(link, index, lambda result, n=link.n: self._done(session, n, result))
+            session.pending.add(future)
+            future.add_done_callback(session.pending.discard)
+        return None
+
+    def _scpi_link(self, suffix):
+        try:
+            return self._link(suffix)
+        except ControlError:
+            raise ScpiError(HEADER_SUFFIX, f'ATT{suffix}')
+
+    @staticmethod
+    def _next_error(session):
+        code, text = session.errors.popleft() if session.errors else (0, 'No error')
+        return f'{code},"{text}"'
+
+    def _query(self, link, node):
+        state = link.state
+        if node == 'level':
+            # Запрос после записи возвращает заданное значение, даже если модуль ещё не опрошен
+            return db_text(state, state.setpoint())
+        if node == 'default':
+            return db_text(state, state.default)
+        if node == 'checkback':
+            return str(int(state.checkback))
+        return str(int(state.connected))
+
+    def _done(self, session, n, result):
+        # Замена уставки более новой до отправки ошибкой не считается: действует последнее значение
+        if isinstance(result, Exception) and not isinstance(result, SetpointSuperseded):
+            session.error(EXECUTION_ERROR, f'ATT{n} {result!r}')
+
+    def _operation_complete(self, session):
+        if not session.pending:
+            return lambda: '1'
+        return asyncio.get_running_loop().create_task(self._wait(list(session.pending)))
+
+    async def _wait(self, pending):
+        await asyncio.gather(*pending)
+        return '1'
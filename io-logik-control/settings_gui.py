@@ -13,14 +13,8 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 class Ui_Form(object):
     def setupUi(self, Form):
         Form.setObjectName("Form")
-        Form.resize(318, 270)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(Form.sizePolicy().hasHeightForWidth())
-        Form.setSizePolicy(sizePolicy)
-        Form.setMinimumSize(QtCore.QSize(318, 270))
-        Form.setMaximumSize(QtCore.QSize(318, 270))
+        Form.resize(560, 360)
+        Form.setMinimumSize(QtCore.QSize(560, 360))
         font = QtGui.QFont()
         font.setPointSize(10)
         Form.setFont(font)
@@ -39,60 +33,33 @@ class Ui_Form(object):
         self.groupBox.setObjectName("groupBox")
         self.gridLayout_3 = QtWidgets.QGridLayout(self.groupBox)
         self.gridLayout_3.setObjectName("gridLayout_3")
-        self.label = QtWidgets.QLabel(self.groupBox)
-        self.label.setObjectName("label")
-        self.gridLayout_3.addWidget(self.label, 0, 0, 1, 1)
-        self.lineEdit_ip_1 = QtWidgets.QLineEdit(self.groupBox)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.lineEdit_ip_1.sizePolicy().hasHeightForWidth())
-        self.lineEdit_ip_1.setSizePolicy(sizePolicy)
-        self.lineEdit_ip_1.setMaximumSize(QtCore.QSize(120, 16777215))
-        self.lineEdit_ip_1.setObjectName("lineEdit_ip_1")
-        self.gridLayout_3.addWidget(self.lineEdit_ip_1, 0, 1, 1, 1)
-        self.label_2 = QtWidgets.QLabel(self.groupBox)
-        self.label_2.setObjectName("label_2")
-        self.gridLayout_3.addWidget(self.label_2, 1, 0, 1, 1)
-        self.lineEdit_tl_1 = QtWidgets.QLineEdit(self.groupBox)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.lineEdit_tl_1.sizePolicy().hasHeightForWidth())
-        self.lineEdit_tl_1.setSizePolicy(sizePolicy)
-        self.lineEdit_tl_1.setMaximumSize(QtCore.QSize(120, 16777215))
-        self.lineEdit_tl_1.setObjectName("lineEdit_tl_1")
-        self.gridLayout_3.addWidget(self.lineEdit_tl_1, 1, 1, 1, 1)
+        self.tableWidget_devices = QtWidgets.QTableWidget(self.groupBox)
+        self.tableWidget_devices.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableWidget_devices.setObjectName("tableWidget_devices")
+        self.tableWidget_devices.setColumnCount(5)
+        self.tableWidget_devices.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_devices.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_devices.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_devices.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_devices.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_devices.setHorizontalHeaderItem(4, item)
+        self.tableWidget_devices.horizontalHeader().setStretchLastSection(True)
+        self.tableWidget_devices.verticalHeader().setVisible(False)
+        self.gridLayout_3.addWidget(self.tableWidget_devices, 0, 0, 1, 3)
+        self.pushButton_add = QtWidgets.QPushButton(self.groupBox)
+        self.pushButton_add.setObjectName("pushButton_add")
+        self.gridLayout_3.addWidget(self.pushButton_add, 1, 0, 1, 1)
+        self.pushButton_remove = QtWidgets.QPushButton(self.groupBox)
+        self.pushButton_remove.setObjectName("pushButton_remove")
+        self.gridLayout_3.addWidget(self.pushButton_remove, 1, 1, 1, 1)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.gridLayout_3.addItem(spacerItem, 1, 2, 1, 1)
         self.gridLayout_2.addWidget(self.groupBox, 2, 0, 1, 2)
-        self.groupBox_2 = QtWidgets.QGroupBox(Form)
-        self.groupBox_2.setObjectName("groupBox_2")
-        self.gridLayout_4 = QtWidgets.QGridLayout(self.groupBox_2)
-        self.gridLayout_4.setObjectName("gridLayout_4")
-        self.label_3 = QtWidgets.QLabel(self.groupBox_2)
-        self.label_3.setObjectName("label_3")
-        self.gridLayout_4.addWidget(self.label_3, 0, 0, 1, 1)
-        self.lineEdit_ip_2 = QtWidgets.QLineEdit(self.groupBox_2)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.lineEdit_ip_2.sizePolicy().hasHeightForWidth())
-        self.lineEdit_ip_2.setSizePolicy(sizePolicy)
-        self.lineEdit_ip_2.setMaximumSize(QtCore.QSize(120, 16777215))
-        self.lineEdit_ip_2.setObjectName("lineEdit_ip_2")
-        self.gridLayout_4.addWidget(self.lineEdit_ip_2, 0, 1, 1, 1)
-        self.label_4 = QtWidgets.QLabel(self.groupBox_2)
-        self.label_4.setObjectName("label_4")
-        self.gridLayout_4.addWidget(self.label_4, 1, 0, 1, 1)
-        self.lineEdit_tl_2 = QtWidgets.QLineEdit(self.groupBox_2)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.lineEdit_tl_2.sizePolicy().hasHeightForWidth())
-        self.lineEdit_tl_2.setSizePolicy(sizePolicy)
-        self.lineEdit_tl_2.setMaximumSize(QtCore.QSize(120, 16777215))
-        self.lineEdit_tl_2.setObjectName("lineEdit_tl_2")
-        self.gridLayout_4.addWidget(self.lineEdit_tl_2, 1, 1, 1, 1)
-        self.gridLayout_2.addWidget(self.groupBox_2, 3, 0, 1, 2)
         self.checkBox_logs = QtWidgets.QCheckBox(Form)
         self.checkBox_logs.setObjectName("checkBox_logs")
         self.gridLayout_2.addWidget(self.checkBox_logs, 5, 0, 1, 2)
@@ -108,8 +75,19 @@ class Ui_Form(object):
         self.comboBox_style.setMaximumSize(QtCore.QSize(120, 16777215))
         self.comboBox_style.setObjectName("comboBox_style")
         self.horizontalLayout.addWidget(self.comboBox_style)
-        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
-        self.horizontalLayout.addItem(spacerItem)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem1)
+        self.label_metrics = QtWidgets.QLabel(Form)
+        self.label_metrics.setObjectName("label_metrics")
+        self.horizontalLayout.addWidget(self.label_metrics)
+        self.lineEdit_metrics_host = QtWidgets.QLineEdit(Form)
+        self.lineEdit_metrics_host.setMaximumSize(QtCore.QSize(120, 16777215))
+        self.lineEdit_metrics_host.setObjectName("lineEdit_metrics_host")
+        self.horizontalLayout.addWidget(self.lineEdit_metrics_host)
+        self.spinBox_metrics_port = QtWidgets.QSpinBox(Form)
+        self.spinBox_metrics_port.setMaximum(65535)
+        self.spinBox_metrics_port.setObjectName("spinBox_metrics_port")
+        self.horizontalLayout.addWidget(self.spinBox_metrics_port)
         self.gridLayout_2.addLayout(self.horizontalLayout, 4, 0, 1, 2)
 
         self.retranslateUi(Form)
@@ -121,16 +99,23 @@ class Ui_Form(object):
         Form.setWindowTitle(_translate("Form", "Настройки"))
         self.pushButton_save.setText(_translate("Form", "Сохранить"))
         self.pushButton_cancel.setText(_translate("Form", "Отмена"))
-        self.groupBox.setTitle(_translate("Form", "1 комплект"))
-        self.label.setText(_translate("Form", "IP-адрес:"))
-        self.lineEdit_ip_1.setText(_translate("Form", "192.168.10.84"))
-        self.label_2.setText(_translate("Form", "Собственные потери, дБ:"))
-        self.lineEdit_tl_1.setText(_translate("Form", "4.5"))
-        self.groupBox_2.setTitle(_translate("Form", "2 комплект"))
-        self.label_3.setText(_translate("Form", "IP-адрес:"))
-        self.lineEdit_ip_2.setText(_translate("Form", "192.168.10.85"))
-        self.label_4.setText(_translate("Form", "Собственные потери, дБ:"))
-        self.lineEdit_tl_2.setText(_translate("Form", "4.5"))
+        self.groupBox.setTitle(_translate("Form", "Модули ioLogik"))
+        item = self.tableWidget_devices.horizontalHeaderItem(0)
+        item.setText(_translate("Form", "№"))
+        item = self.tableWidget_devices.horizontalHeaderItem(1)
+        item.setText(_translate("Form", "IP-адрес"))
+        item = self.tableWidget_devices.horizontalHeaderItem(2)
+        item.setText(_translate("Form", "Порт"))
+        item = self.tableWidget_devices.horizontalHeaderItem(3)
+        item.setText(_translate("Form", "Адрес Modbus"))
+        item = self.tableWidget_devices.horizontalHeaderItem(4)
+        item.setText(_translate("Form", "Собственные потери, дБ"))
+        self.pushButton_add.setText(_translate("Form", "Добавить"))
+        self.pushButton_remove.setText(_translate("Form", "Удалить"))
         self.checkBox_logs.setText(_translate("Form", "Записывать log-файлы"))
         self.label_5.setText(_translate("Form", "Оформление:"))
+        self.label_metrics.setText(_translate("Form", "Метрики:"))
+        self.lineEdit_metrics_host.setToolTip(_translate("Form", "Адрес сервера метрик: 127.0.0.1 - только этот ПК, 0.0.0.0 - для сбора по сети"))
+        self.spinBox_metrics_port.setToolTip(_translate("Form", "HTTP-порт для метрик в формате Prometheus (/metrics), 0 - отключено"))
+        self.spinBox_metrics_port.setSpecialValueText(_translate("Form", "выкл."))
 import resources_rc
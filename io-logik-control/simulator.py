@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import random
+import struct
+
+try:
+    import resource
+except ImportError:
+    # Windows: ограничения на число дескрипторов задаются не через RLIMIT_NOFILE
+    resource = None
+
+from devices import Device, DeviceRegistry
+from modbus_async import READ_COILS, READ_DISCRETE_INPUTS, WRITE_MULTIPLE_COILS, pack_bits, unpack_bits
+
+
+WRITE_SINGLE_COIL = 0x05
+
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+
+
+class Faults:
+    def __init__(self, latency=0, jitter=0, drop=0, disconnect=0, checkback=0, switch_time=0.005):
+        # Задержка ответа latency + случайная добавка до jitter секунд
+        self.latency = latency
+        self.jitter = jitter
+        # Вероятности: запрос остаётся без ответа, соединение рвётся, реле встаёт не в то положение
+        self.drop = drop
+        self.disconnect = disconnect
+        self.checkback = checkback
+        # Время переключения реле аттенюатора: до его истечения обратная связь показывает прежнее положение
+        self.switch_time = switch_time
+
+
+class SimulatedModule:
+    # ioLogik E2210: катушки 0-5 — текущее ослабление ZSAT-31R5, 6-11 — ослабление по умолчанию,
+    # дискретные входы 0-5 — контакты обратной связи реле аттенюатора
+    def __init__(self, faults, rng, coils=12, inputs=6):
+        self.faults = faults
+        self.rng = rng
+        self.coils = [0] * coils
+        self.relays = [0] * inputs
+        self.stuck = set()
+        self.requests = 0
+        self.dropped = 0
+        self.disconnects = 0
+        self.checkback_faults = 0
+        self._switch = None
+
+    def inputs(self):
+        return [0 if i in self.stuck else bit for i, bit in enumerate(self.relays)]
+
+    def write(self, address, values):
+        self.coils[address:address + len(values)] = values
+        if address >= len(self.relays):
+            return
+        target = self.coils[:len(self.relays)]
+        if self.faults.checkback and self.rng.random() < self.faults.checkback:
+            self.checkback_faults += 1
+            target[self.rng.randrange(len(target))] ^= 1
+        if self._switch is not None:
+            self._switch.cancel()
+        if self.faults.switch_time:
+            self._switch = asyncio.get_running_loop().call_later(self.faults.switch_time, self._set_relays, target)
+        else:
+            self._set_relays(target)
+
+    def _set_relays(self, target):
+        self.relays = target
+        self._switch = None
+
+    def handle(self, pdu):
+        function = pdu[0]
+        if function in (READ_COILS, READ_DISCRETE_INPUTS):
+            address, count = struct.unpack('>HH', pdu[1:5])
+            bits = self.coils if function == READ_COILS else self.inputs()
+            if not 1 <= count or address + count > len(bits):
+                return self.exception(function, ILLEGAL_DATA_ADDRESS)
+            data = pack_bits(bits[address:address + count])
+            return struct.pack('>BB', function, len(data)) + data
+        if function == WRITE_MULTIPLE_COILS:
+            address, count, size = struct.unpack('>HHB', pdu[1:6])
+            if not 1 <= count or address + count > len(self.coils):
+                return self.exception(function, ILLEGAL_DATA_ADDRESS)
+            if size != (count + 7) // 8:
+                return self.exception(function, ILLEGAL_DATA_VALUE)
+            self.write(address, [int(bit) for bit in unpack_bits(pdu[6:6 + size], count)])
+            return pdu[:5]
+        if function == WRITE_SINGLE_COIL:
+            address, value = struct.unpack('>HH', pdu[1:5])
+            if address >= len(self.coils):
+                return self.exception(function, ILLEGAL_DATA_ADDRESS)
+            if value not in (0x0000, 0xFF00):
+                return self.exception(function, ILLEGAL_DATA_VALUE)
+            self.write(address, [int(value == 0xFF00)])
+            return pdu[:5]
+        return self.exception(function, ILLEGAL_FUNCTION)
+
+    @staticmethod
+    def exception(function, code):
+        return struct.pack('>BB', function | 0x80, code)
+
+    async def serve(self, reader, writer):
+        faults = self.faults
+        try:
+            while True:
+                tid, pid, length, unit = struct.unpack('>HHHB', await reader.readexactly(7))
+                pdu = await reader.readexactly(length - 1)
+                self.requests += 1
+                if faults.disconnect and self.rng.random() < faults.disconnect:
+                    self.disconnects += 1
+                    break
+                if faults.drop and self.rng.random() < faults.drop:
+                    self.dropped += 1
+                    continue
+                # Модуль обрабатывает запросы по одному, поэтому задержка ответа накапливается в очереди
+                delay = faults.latency + (self.rng.uniform(0, faults.jitter) if faults.jitter else 0)
+                if delay:
+                    await asyncio.sleep(delay)
+                response = self.handle(pdu)
+                writer.write(struct.pack('>HHHB', tid, pid, len(response) + 1, unit) + response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def raise_open_files(needed):
+    # Каждому модулю нужен прослушивающий и принятый сокет, клиенту — свой; 1024 по умолчанию хватает на ~500 модулей
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE,
+                           (needed if hard == resource.RLIM_INFINITY else min(needed, hard), hard))
+
+
+class Simulator:
+    def __init__(self, count=1, host='127.0.0.1', port=15020, faults=None, seed=None):
+        self.host = host
+        self.port = port
+        self.faults = faults or Faults()
+        self.rng = random.Random(seed)
+        self.modules = [SimulatedModule(self.faults, self.rng) for _ in range(count)]
+        self.servers = []
+
+    async def start(self):
+        for i, module in enumerate(self.modules):
+            self.servers.append(await asyncio.start_server(module.serve, self.host, self.port + i, backlog=1024))
+
+    async def stop(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        self.servers = []
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    def run(self):
+        raise_open_files(2 * len(self.modules) + 256)
+        asyncio.run(self.serve_forever())
+
+    def devices(self, first_id=1):
+        return DeviceRegistry(Device(first_id + i, self.host, self.port + i) for i in range(len(self.modules)))
+
+    def stats(self):
+        keys = ['requests', 'dropped', 'disconnects', 'checkback_faults']
+        return {key: sum(getattr(module, key) for module in self.modules) for key in keys}
+
+
+def run_simulator(count, host, port, faults=None, seed=None):
+    # Точка входа для отдельного процесса (multiprocessing)
+    Simulator(count, host, port, faults, seed).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Имитатор модулей ioLogik E2210 с аттенюаторами ZSAT-31R5')
+    parser.add_argument('--modules', type=int, default=2, help='число модулей, каждый на своём порту')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=15020, help='порт первого модуля')
+    parser.add_argument('--latency', type=float, default=0, help='задержка ответа, мс')
+    parser.add_argument('--jitter', type=float, default=0, help='случайная добавка к задержке, мс')
+    parser.add_argument('--drop', type=float, default=0, help='доля запросов без ответа')
+    parser.add_argument('--disconnect', type=float, default=0, help='доля запросов, на которых рвётся соединение')
+    parser.add_argument('--checkback-fault', type=float, default=0,
+                        help='доля записей, после которых одно реле встаёт не в то положение')
+    parser.add_argument('--stuck-input', type=int, action='append', default=[],
+                        help='вход обратной связи, залипший в 0 на всех модулях')
+    parser.add_argument('--switch-time', type=float, default=5, help='время переключения реле, мс')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--devices', help='записать список модулей в JSON для main.py --devices')
+    args = parser.parse_args()
+
+    faults = Faults(args.latency / 1000, args.jitter / 1000, args.drop, args.disconnect, args.checkback_fault,
+                    args.switch_time / 1000)
+    simulator = Simulator(args.modules, args.host, args.port, faults, args.seed)
+    for module in simulator.modules:
+        module.stuck.update(args.stuck_input)
+    if args.devices:
+        simulator.devices().save(args.devices)
+    print(f'Модулей: {args.modules}, {args.host}:{args.port}-{args.port + args.modules - 1}')
+    try:
+        simulator.run()
+    except KeyboardInterrupt:
+        pass
+    print(', '.join(f'{key}: {value}' for key, value in simulator.stats().items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import copy
+import time
+
+from breaker import CLOSED
+
+
+FIELDS = ['connected', 'att', 'default', 'target', 'checkback', 'breaker',
+          'connected_at', 'polled_at', 'changed_at', 'written_at']
+
+
+class DeviceState:
+    def __init__(self, device):
+        self.device = device
+        self.n = device.id
+        self.connected = False
+        # Ступени аттенюатора по катушкам модуля; None до первого успешного опроса
+        self.att = None
+        self.default = None
+        # Последняя заданная ступень, ещё не записанная в модуль
+        self.target = None
+        self.checkback = True
+        self.breaker = CLOSED
+        self.connected_at = None
+        self.polled_at = None
+        self.changed_at = None
+        self.written_at = None
+
+    def setpoint(self):
+        return self.att if self.target is None else self.target
+
+    def key(self):
+        return self.connected, self.att, self.default, self.target, self.checkback, self.breaker
+
+    def copy(self):
+        return copy.copy(self)
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in FIELDS}
+
+    @classmethod
+    def from_dict(cls, device, data):
+        state = cls(device)
+        for key in FIELDS:
+            setattr(state, key, data[key])
+        return state
+
+    def poll_ok(self, att, default, checkback):
+        now = time.time()
+        if not self.connected:
+            self.connected = True
+            self.connected_at = now
+        if (att, default, checkback) != (self.att, self.default, self.checkback):
+            self.att, self.default, self.checkback = att, default, checkback
+            self.changed_at = now
+        self.polled_at = now
+
+    def poll_failed(self):
+        if self.connected:
+            self.connected = False
+            self.changed_at = time.time()
+
+    def written(self, att, checkback):
+        now = time.time()
+        self.att = att
+        self.checkback = checkback
+        self.changed_at = self.written_at = now
+
+    def default_written(self, default):
+        now = time.time()
+        self.default = default
+        self.changed_at = self.written_at = now
@@ -0,0 +1,56 @@
+import json
+import os
+import time
+
+from journal import Journal, query
+
+
+def test_query_after_restart(tmp_path):
+    now = time.time()
+    journal = Journal(str(tmp_path))
+    journal.append(now, 1, 'setpoint', 1, {'att': 10})
+    journal.append(now + 1, 2, 'setpoint', 2, {'att': 20})
+    journal.close()
+    journal = Journal(str(tmp_path))
+    journal.append(now + 2, 3, 'setpoint', 1, {'att': 30})
+    journal.close()
+
+    assert [record['att'] for record in query(str(tmp_path), device=1)] == [10, 30]
+    assert [record['att'] for record in query(str(tmp_path))] == [10, 20, 30]
+
+
+def test_query_after_run_without_close(tmp_path):
+    # Первый запуск завершается без close: его блок не попадает в индекс
+    now = time.time()
+    journal = Journal(str(tmp_path))
+    journal.append(now, 1, 'setpoint', 1, {'att': 10})
+    journal.append(now + 1, 2, 'connection', 2, {'connected': True})
+    journal.flush()
+    journal.file.close()
+    journal.index_file.close()
+
+    journal = Journal(str(tmp_path))
+    journal.append(now + 2, 3, 'setpoint', 1, {'att': 30})
+    journal.close()
+
+    assert [record['att'] for record in query(str(tmp_path), device=1, event='setpoint')] == [10, 30]
+    assert [record['event'] for record in query(str(tmp_path), device=2)] == ['connection']
+
+
+def test_partial_line_discarded(tmp_path):
+    now = time.time()
+    journal = Journal(str(tmp_path))
+    journal.append(now, 1, 'setpoint', 1, {'att': 10})
+    journal.flush()
+    journal.file.write(b'{"ts": ')
+    journal.file.close()
+    journal.index_file.close()
+
+    journal = Journal(str(tmp_path))
+    journal.append(now + 1, 2, 'setpoint', 1, {'att': 30})
+    journal.close()
+
+    assert [record['att'] for record in query(str(tmp_path), device=1)] == [10, 30]
+    name = os.path.join(str(tmp_path), time.strftime('%Y%m%d', time.localtime(now)))
+    with open(f'{name}.jsonl', 'rb') as f:
+        assert all(json.loads(line) for line in f)
@@ -0,0 +1,91 @@
+import collections
+import itertools
+import threading
+import time
+
+from engine import SetpointSuperseded
+
+
+class Trace:
+    def __init__(self, tracer, trace_id, n, label):
+        self.tracer = tracer
+        self.id = trace_id
+        self.n = n
+        self.label = label
+        self.wall = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.status = 'ok'
+        self.queued = None
+        self.done_at = None
+        # Трасса закрывается, когда результат доставлен в интерфейс и подтверждён следующим опросом
+        self.pending = {'gui', 'poll'}
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def span(self, name, start, end=None):
+        end = time.perf_counter() if end is None else end
+        self.spans.append((name, start - self.start, end - self.start))
+
+    def duration(self):
+        return max((end for _, _, end in self.spans), default=0)
+
+    def done(self, part, status=None):
+        with self._lock:
+            if status is not None and self.status == 'ok':
+                self.status = status
+            self.pending.discard(part)
+            if self.pending or self.finished:
+                return
+            self.finished = True
+        self.tracer.finish(self)
+
+    def abort(self, status):
+        with self._lock:
+            if self.finished:
+                return
+            self.finished = True
+            self.status = status
+        self.tracer.finish(self)
+
+    def to_dict(self):
+        return {'id': self.id, 'device': self.n, 'label': self.label, 'ts': round(self.wall, 3),
+                'status': self.status, 'duration': round(self.duration(), 6),
+                'spans': [[name, round(start, 6), round(end, 6)] for name, start, end in self.spans]}
+
+
+class Tracer:
+    def __init__(self, size=500):
+        self.traces = collections.deque(maxlen=size)
+        self.ids = itertools.count(1)
+        self.on_finish = None
+
+    def start(self, n, label):
+        return Trace(self, next(self.ids), n, label)
+
+    def finish(self, trace):
+        self.traces.append(trace)
+        if self.on_finish is not None:
+            self.on_finish(trace)
+
+
+def journal_trace(journal, trace):
+    values = trace.to_dict()
+    del values['device']
+    journal('trace', trace.n, **values)
+
+
+def finish_setpoint(trace, n, att, result, journal):
+    # Результат уставки закрывает её трассу и записывается в журнал. Уставка, заменённая более новой
+    # до отправки, не записывалась, её трасса уже закрыта: для неё возвращается False
+    if isinstance(result, SetpointSuperseded):
+        return False
+    if trace.done_at is not None:
+        trace.span('deliver', trace.done_at)
+    if isinstance(result, Exception):
+        trace.abort('error')
+        journal('setpoint_error', n, att=att, error=repr(result))
+    else:
+        trace.done('gui', None if result['verified'] else 'unverified')
+        journal('setpoint', n, att=att, verified=result['verified'], latency=round(result['latency'], 6))
+    return True
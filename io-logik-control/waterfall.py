@@ -0,0 +1,48 @@
+from PyQt5 import QtWidgets, QtGui
+from PyQt5.QtCore import Qt, QRectF
+
+
+STAGE_NAMES = {'gui': 'интерфейс', 'queue': 'очередь', 'write': 'запись', 'settle': 'ожидание',
+               'checkback': 'обратная связь', 'deliver': 'доставка', 'poll_confirm': 'подтверждение опросом',
+               'daemon': 'служба'}
+
+STAGE_COLORS = {'gui': '#8e8e8e', 'queue': '#d9a441', 'write': '#e0672a', 'settle': '#6b8fb3',
+                'checkback': '#4f9d69', 'deliver': '#a66bb3', 'poll_confirm': '#3fa7a3',
+                'daemon': '#b35d5d'}
+
+
+class WaterfallWidget(QtWidgets.QWidget):
+    row_height = 22
+    label_width = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trace = None
+
+    def set_trace(self, trace):
+        self.trace = trace
+        self.setMinimumHeight(self.row_height * (len(trace.spans) + 2) if trace is not None else 0)
+        self.update()
+
+    def paintEvent(self, event):
+        if self.trace is None or not self.trace.spans:
+            return
+        painter = QtGui.QPainter(self)
+        metrics = painter.fontMetrics()
+        total = self.trace.duration() or 1
+        width = max(self.width() - self.label_width - 80, 10)
+        for row, (name, start, end) in enumerate(sorted(self.trace.spans, key=lambda span: span[1])):
+            y = row * self.row_height + 4
+            painter.setPen(self.palette().color(QtGui.QPalette.WindowText))
+            painter.drawText(QRectF(4, y, self.label_width - 8, self.row_height - 4),
+                             Qt.AlignVCenter | Qt.AlignLeft, STAGE_NAMES.get(name, name))
+            # Полоса этапа ставится на общую шкалу от начала трассы, нулевые этапы видны как штрих
+            x = self.label_width + start / total * width
+            bar = QRectF(x, y + 2, max((end - start) / total * width, 2), self.row_height - 8)
+            painter.fillRect(bar, QtGui.QColor(STAGE_COLORS.get(name, '#8e8e8e')))
+            painter.drawText(QRectF(bar.right() + 4, y, 80, self.row_height - 4), Qt.AlignVCenter | Qt.AlignLeft,
+                             f'{(end - start) * 1000:.1f} мс')
+        y = len(self.trace.spans) * self.row_height + 4
+        painter.drawText(QRectF(self.label_width, y, width, metrics.height() + 4), Qt.AlignRight | Qt.AlignVCenter,
+                         f'Итого {total * 1000:.1f} мс')
+        painter.end()